@@ -0,0 +1,187 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import pygame
+
+from main import (Game, RandomInput, init_pygame, WINDOW_WIDTH, WINDOW_HEIGHT, TORNADO_RADIUS,
+                  TORNADO_SPEED, TORNADO_SPAWN_RATE_INITIAL, TORNADO_SPAWN_RATE_MIN, np)
+
+#Benchmarks reproductibles des systèmes ECS
+POPULATIONS = (10, 100, 1000, 10000)
+BENCHMARKS = ('movement', 'tornado', 'churn', 'collision', 'render', 'tick')
+#Tornades qui sortent de l'écran et spawns au taux maximal pendant la mesure
+CHURN_BENCHMARKS = ('churn',)
+DEFAULT_ITERATIONS = 120
+WORLD_TICKS = 30  #Appels chronométrés avant de reconstruire le monde (hors chrono)
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.10  #Régression si la médiane est plus de 10% plus lente que la référence
+BENCH_SEED = 1234
+
+def populate(game: Game, count: int, seed: int, churn: bool = False):
+    #Monde synthétique : l'hélico + `count` tornades réparties sur l'écran
+    game.setup_game_world(seed)
+    game.input_source = RandomInput(seed)
+    rng = random.Random(seed)
+    if churn:
+        #Jusqu'en bas de l'écran : les tornades des dernières lignes sortent et sont supprimées pendant la mesure
+        max_y = WINDOW_HEIGHT
+    else:
+        #Marge en bas pour qu'aucune tornade ne sorte avant la reconstruction du monde
+        max_y = WINDOW_HEIGHT - TORNADO_SPEED * (WORLD_TICKS + 1)
+    tornado_system = game.tornado_system
+    for _ in range(count):
+        tornado_system.spawn_tornado(game.world)
+    if tornado_system.field is not None:
+        field = tornado_system.field
+        field.x[:field.count] = [rng.uniform(TORNADO_RADIUS, WINDOW_WIDTH - TORNADO_RADIUS) for _ in range(field.count)]
+        field.y[:field.count] = [rng.uniform(-TORNADO_RADIUS, max_y) for _ in range(field.count)]
+    else:
+        for _, pos, _ in game.world.query('position', 'tornado'):
+            pos.x = rng.uniform(TORNADO_RADIUS, WINDOW_WIDTH - TORNADO_RADIUS)
+            pos.y = rng.uniform(-TORNADO_RADIUS, max_y)
+            pos.version += 1
+    if churn:
+        #Taux de spawn maximal, première tornade dès le premier appel
+        game.world.resources['spawn_rate'] = TORNADO_SPAWN_RATE_MIN
+        tornado_system.spawn_counter = TORNADO_SPAWN_RATE_MIN - 1
+    else:
+        #Le compteur de spawn repart de zéro pour que chaque répétition fasse le même travail
+        game.world.resources['spawn_rate'] = TORNADO_SPAWN_RATE_INITIAL
+        tornado_system.spawn_counter = 0
+
+def benchmark_step(game: Game, name: str, background: pygame.Surface) -> Callable[[], None]:
+    world = game.world
+    if name == 'movement':
+        def run():
+            world.resources['input'] = game.input_source.read()
+            game.input_system.update(world)
+            game.movement_system.update(world)
+    elif name in ('tornado', 'churn'):
+        def run():
+            game.tornado_system.update(world)
+            world.flush()
+    elif name == 'collision':
+        def run():
+            #La grille ne met à jour que les colliders qui ont bougé : déplacer les tornades à chaque appel
+            game.tornado_system.update(world)
+            world.flush()
+            game.collision_system.update(world)
+            game.tornado_system.hit_player(world)
+    elif name == 'render':
+        def run():
+            game.render_system.begin_frame(background)
+            game.render_system.update(world)
+            game.render_system.draw_queue()
+    else:
+        def run():
+            game.step()
+            game.render_system.begin_frame(background)
+            game.render_system.update(world)
+            game.render_system.draw_queue()
+    return run
+
+def measure(game: Game, name: str, count: int, iterations: int, repeats: int,
+            background: pygame.Surface) -> Dict[str, float]:
+    churn = name in CHURN_BENCHMARKS
+    samples = []
+    for repeat in range(repeats):
+        elapsed = 0
+        done = 0
+        while done < iterations:
+            #Monde reconstruit tous les WORLD_TICKS appels pour garder une population comparable
+            populate(game, count, BENCH_SEED + repeat, churn)
+            run = benchmark_step(game, name, background)
+            calls = min(WORLD_TICKS, iterations - done)
+            start = time.perf_counter_ns()
+            for _ in range(calls):
+                run()
+            elapsed += time.perf_counter_ns() - start
+            done += calls
+        samples.append(elapsed / iterations / 1000)
+    return {
+        'median_us': statistics.median(samples),
+        'min_us': min(samples),
+        'max_us': max(samples),
+    }
+
+def run_benchmarks(populations: List[int], vectorized: bool, iterations: int, repeats: int) -> Dict:
+    #Vraie surface d'affichage (pilote factice) pour que les images soient converties comme en jeu
+    init_pygame(headless=True)
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    game = Game(vectorized=vectorized, headless=True)
+    game.screen = game.render_system.screen = screen
+    background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    background.fill((0, 0, 64))
+    results = {}
+    for count in populations:
+        for name in BENCHMARKS:
+            result = measure(game, name, count, iterations, repeats, background)
+            results[f"{name}/{count}"] = result
+            print(f"{name:<10} {count:>6} tornadoes: median {result['median_us']:10.1f} us  "
+                  f"min {result['min_us']:10.1f} us")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__ if np is not None else None,
+            'platform': platform.platform(),
+            'vectorized': vectorized,
+            'iterations': iterations,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    if current['meta']['vectorized'] != baseline['meta'].get('vectorized'):
+        print("warning: baseline was recorded with a different tornado simulation mode")
+    regressions = []
+    for key, result in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        ratio = result['median_us'] / reference['median_us']
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"{key:<18} {reference['median_us']:10.1f} -> {result['median_us']:10.1f} us  "
+              f"({(ratio - 1) * 100:+6.1f}%)  {status}")
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return regressions
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the Bermuda Explorer ECS systems")
+    parser.add_argument("--populations", type=int, nargs='+', default=list(POPULATIONS),
+                        help="tornado counts of the synthetic worlds")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="benchmark the NumPy tornado simulation")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="calls per measurement")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="measurements per benchmark, each on a freshly built world")
+    parser.add_argument("--output", metavar="PATH", default=None,
+                        help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", default=None,
+                        help="compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before flagging a regression (0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    current = run_benchmarks(args.populations, args.vectorized, args.iterations, args.repeats)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(current, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
@@ -1,12 +1,23 @@
 import pygame
+import os
 import sys
-from typing import List, Dict, Optional
+import time
+import csv
+import json
+import struct
+from array import array
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, FrozenSet, Iterator, Tuple
 import math
 import random
+from collections import OrderedDict, deque
 
-#Initialisation de Pygame
-pygame.init()
-pygame.mixer.init()  # Initialiser le système audio
+try:
+    import numpy as np
+except ImportError:  #NumPy est optionnel : seulement requis pour les tornades vectorisées
+    np = None
 
 #Constants
 WINDOW_WIDTH = 800
@@ -14,6 +25,7 @@ WINDOW_HEIGHT = 600
 FPS = 60
 TITLE_FONT_SIZE = 100
 SUBTITLE_FONT_SIZE = 40
+PROFILER_FONT_SIZE = 22
 GAME_TITLE = "BERMUDA EXPLORER"
 START_TEXT = "Press space to start"
 MISSION_TITLE = "YOUR MISSION:"
@@ -33,227 +45,1858 @@ TORNADO_SPAWN_RATE_INITIAL = 60  #Taux initial de spawn
 TORNADO_SPAWN_RATE_MIN = 15      #Taux le plus rapide
 DIFFICULTY_INCREASE_INTERVAL = 3 #Augmente la difficulté toutes les X secondes
 TORNADO_SPRITE = "./assets/images/tornado-sprite.png"  
+TORNADO_SPRITE_SIZE = int(TORNADO_RADIUS * 2.5)  #Un peu plus grand que la hitbox
+HELI_SPRITE = "./assets/images/heli-sprite.png"
+ROTOR_SPRITE = "./assets/images/rotor-sprite.png"
+BOAT_SPRITE = "./assets/images/boat-sprite.png"
+MENU_IMAGE = "./assets/images/heli-menu.png"
+MENU_IMAGE_SIZE = (634, 215)
 TORNADO_ROTATION_SPEED = 5  #Vitesse de rota tornade
 BACKGROUND_MUSIC = "./assets/sounds/Supercopter.mp3"
+MUSIC_VOLUME = 0.4  #Volume par défaut de la musique (0.0 à 1.0)
+MUSIC_FADE_MS = 1000  #Durée des fondus de musique
+VOLUME_STEP = 0.1  #Pas des touches de volume
+ROTATION_STEPS = 72  #Angles quantifiés par sprite (pas de 5°)
+ROTATION_CACHE_SIZE = 512  #Nb max d'images tournées gardées en mémoire (LRU)
+DIRTY_RECT_MAX_COVERAGE = 0.5  #Au-delà de cette fraction de l'écran, flip complet
+TORNADO_POOL_SIZE = 256  #Nb max de tornades gardées dans la free list
+TICK_DURATION = 1 / FPS  #La simulation avance à pas fixe, FPS ticks par seconde
+MAX_RENDER_FPS = 144  #Plafond par défaut des frames de jeu affichées (la vsync peut être ignorée par le pilote)
+MAX_CATCH_UP_TICKS = 5  #Ticks max par frame affichée ; au-delà le retard est abandonné
+COLLISION_CELL_SIZE = 64  #Taille des cellules de la grille de collision
+COLLISION_LAYER_PLAYER = 1
+COLLISION_LAYER_TORNADO = 2
+
+#Couches de rendu, dessinées dans l'ordre croissant
+LAYER_BOAT = 0
+LAYER_SPRITE = 1  #Hélico et autres sprites
+LAYER_ROTOR = 2  #Toujours au-dessus de l'hélico
+LAYER_TORNADO = 3
+LAYER_UI = 4  #Timer, écran de game over, fondu
+LAYER_DEBUG = 5  #Overlay de profilage
+
+#Touches (bits du masque d'entrée)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+
+#Tailles des entités de l'intro
+BOAT_WIDTH = 103
+BOAT_HEIGHT = 212
+HELI_SIZE = 104  #Un carré
+ROTOR_SIZE = 92  #Taille du rotor, proportionnelle à l'hélico
 
 #Couleurs
 BLACK = (0, 0, 0)
 BLUE = (0, 0, 255)
 WHITE = (255, 255, 255)
 
-class Entity:
-    def __init__(self):
-        self.id = id(self)
-        self.components: Dict = {}
+#Assets décodés en arrière-plan pendant le menu, dans l'ordre où le jeu en a besoin
+#(type, chemin, taille) ; 'background' est converti sans canal alpha
+ASSET_MANIFEST = (
+    ('image', MENU_IMAGE, MENU_IMAGE_SIZE),
+    ('background', BACKGROUND_ANIMATION, (WINDOW_WIDTH, WINDOW_HEIGHT)),
+    ('image', BOAT_SPRITE, (BOAT_WIDTH, BOAT_HEIGHT)),
+    ('image', HELI_SPRITE, (HELI_SIZE, HELI_SIZE)),
+    ('image', ROTOR_SPRITE, (ROTOR_SIZE, ROTOR_SIZE)),
+    ('image', TORNADO_SPRITE, (TORNADO_SPRITE_SIZE, TORNADO_SPRITE_SIZE)),
+    ('background', BACKGROUND_GAME, (WINDOW_WIDTH, WINDOW_HEIGHT)),
+)
+
+#Cache d'assets partagé
+class RotationAtlas:
+    __slots__ = ('cache', 'key', 'source', 'steps', 'sizes', 'masks')
+
+    def __init__(self, cache: 'AssetCache', key: tuple, steps: int):
+        self.cache = cache
+        self.key = key
+        self.source: Optional[pygame.Surface] = None  #Image non tournée, chargée au premier usage
+        self.steps = steps
+        #Taille de chaque angle, gardée même quand l'image sort du cache LRU
+        self.sizes: List[Optional[Tuple[int, int]]] = [None] * steps
+        #Masques de collision au pixel près, un par angle, construits à la demande
+        self.masks: List[Optional[pygame.mask.Mask]] = [None] * steps
+
+    @property
+    def image(self) -> pygame.Surface:
+        if self.source is None:
+            path, size, _ = self.key
+            self.source = self.cache.image(path, size)
+        return self.source
+
+    def index(self, angle: float) -> int:
+        #Quantifier un angle en degrés vers un index de l'atlas
+        return round(angle * self.steps / 360) % self.steps
+
+    def frame(self, index: int) -> pygame.Surface:
+        return self.cache.rotated(self, index)
+
+    def size(self, index: int) -> Tuple[int, int]:
+        size = self.sizes[index]
+        if size is None:
+            size = self.sizes[index] = self.frame(index).get_size()
+        return size
+
+    def mask(self, index: int) -> pygame.mask.Mask:
+        mask = self.masks[index]
+        if mask is None:
+            mask = self.masks[index] = pygame.mask.from_surface(self.frame(index))
+        return mask
+
+    @property
+    def radius(self) -> float:
+        #Rayon du cercle qui contient l'image quel que soit l'angle
+        width, height = self.image.get_size()
+        return math.hypot(width, height) / 2
+
+class AssetCache:
+    def __init__(self, rotation_steps: int = ROTATION_STEPS, max_frames: int = ROTATION_CACHE_SIZE):
+        self.rotation_steps = rotation_steps
+        self.max_frames = max_frames
+        self.images: Dict[tuple, pygame.Surface] = {}
+        self.atlases: Dict[tuple, RotationAtlas] = {}
+        self.frames: OrderedDict = OrderedDict()  #(clé atlas, index) -> image tournée
+
+    def image(self, path: str, size: Optional[Tuple[int, int]] = None, opaque: bool = False) -> pygame.Surface:
+        #Charger une image une seule fois, redimensionnée puis convertie au format de l'écran
+        key = (path, size)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.image.load(path)
+            surface_allocations.add()
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+                surface_allocations.add()
+            if pygame.display.get_surface() is not None:
+                image = image.convert() if opaque else image.convert_alpha()
+                surface_allocations.add()
+            #setdefault : si le thread de préchargement a gagné la course, garder son image
+            image = self.images.setdefault(key, image)
+        return image
+
+    def has_image(self, path: str, size: Optional[Tuple[int, int]] = None) -> bool:
+        return (path, size) in self.images
+
+    def atlas(self, path: str, size: Optional[Tuple[int, int]] = None, steps: Optional[int] = None) -> RotationAtlas:
+        steps = steps or self.rotation_steps
+        key = (path, size, steps)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = RotationAtlas(self, key, steps)
+            self.atlases[key] = atlas
+        return atlas
+
+    def rotated(self, atlas: RotationAtlas, index: int) -> pygame.Surface:
+        if index == 0:
+            return atlas.image
+        key = (atlas.key, index)
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.frames.move_to_end(key)
+            return frame
+        #Construction paresseuse de l'angle demandé
+        frame = pygame.transform.rotate(atlas.image, index * 360 / atlas.steps)
+        surface_allocations.add()
+        self.frames[key] = frame
+        if len(self.frames) > self.max_frames:
+            self.frames.popitem(last=False)
+        return frame
+
+class AssetLoader:
+    #Décode le manifeste sur un thread pendant que le thread principal affiche les menus
+    def __init__(self, assets: 'AssetCache', manifest: tuple = ASSET_MANIFEST):
+        self.assets = assets
+        self.manifest = manifest
+        self.loaded = 0
+        self.error: Optional[Exception] = None
+        self.thread = threading.Thread(target=self.load_all, name="asset-loader", daemon=True)
+
+    def start(self) -> 'AssetLoader':
+        self.thread.start()
+        return self
+
+    def load_all(self):
+        for kind, path, size in self.manifest:
+            try:
+                self.assets.image(path, size, opaque=kind == 'background')
+            except Exception as error:  #Relancée sur le thread principal par wait()
+                self.error = error
+                return
+            self.loaded += 1
+
+    @property
+    def done(self) -> bool:
+        return self.loaded == len(self.manifest) or self.error is not None
+
+    def progress(self) -> float:
+        return self.loaded / len(self.manifest)
+
+    def wait(self):
+        #Bloque seulement si le joueur a été plus rapide que le chargement
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+class Audio:
+    #Musique lue en streaming (pygame.mixer.music) plutôt que décodée en mémoire
+    def __init__(self, enabled: bool = True, music_volume: float = MUSIC_VOLUME):
+        self.music_volume = music_volume
+        self.track: Optional[str] = None  #Piste en cours (ou en fondu de sortie)
+        self.pending: Optional[Tuple[str, int]] = None  #Piste suivante et durée de son fondu d'entrée
+        self.enabled = enabled and self.open_device()
+
+    def open_device(self) -> bool:
+        #Sans périphérique audio, le jeu continue en silence
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as error:
+            print(f"warning: audio disabled ({error})", file=sys.stderr)
+            return False
+        return True
+
+    def play_music(self, path: str, fade_ms: int = MUSIC_FADE_MS):
+        #Fondu enchaîné : la piste courante s'éteint, la suivante démarre en fondu dans update()
+        if not self.enabled or path == self.track:
+            return
+        if self.track is not None and pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade_ms)
+            self.pending = (path, fade_ms)
+        else:
+            self.start_music(path, fade_ms)
+
+    def start_music(self, path: str, fade_ms: int):
+        self.pending = None
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(self.music_volume)
+            pygame.mixer.music.play(loops=-1, fade_ms=fade_ms)
+        except (pygame.error, FileNotFoundError) as error:
+            print(f"warning: cannot play {path} ({error})", file=sys.stderr)
+            self.track = None
+            return
+        self.track = path
+
+    def update(self):
+        #Une seule piste en streaming : la suivante attend la fin du fondu de sortie
+        if self.pending is not None and not pygame.mixer.music.get_busy():
+            self.start_music(*self.pending)
+
+    def set_music_volume(self, volume: float):
+        self.music_volume = min(1.0, max(0.0, volume))
+        if self.enabled:
+            pygame.mixer.music.set_volume(self.music_volume)
+
+    def quit(self):
+        if self.enabled:
+            pygame.mixer.music.stop()
+            pygame.mixer.quit()
+            self.enabled = False
+
+class TextCache:
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.fonts: Dict[int, pygame.font.Font] = {}
+        self.rendered: OrderedDict = OrderedDict()  #(texte, taille, couleur) -> surface
+
+    def font(self, size: int) -> pygame.font.Font:
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text: str, size: int, color: tuple = WHITE) -> pygame.Surface:
+        key = (text, size, color)
+        surface = self.rendered.get(key)
+        if surface is not None:
+            self.rendered.move_to_end(key)
+            return surface
+        surface = self.font(size).render(text, True, color)
+        surface_allocations.add()
+        self.rendered[key] = surface
+        if len(self.rendered) > self.max_entries:
+            self.rendered.popitem(last=False)
+        return surface
+
+class CachedScreen:
+    def __init__(self, build):
+        self.build = build  #Fonction qui dessine l'écran complet
+        self.key = None
+        self.surface: Optional[pygame.Surface] = None
+
+    def get(self, key) -> pygame.Surface:
+        #La clé regroupe les entrées de l'écran (taille de fenêtre, temps survécu...)
+        if self.surface is None or key != self.key:
+            self.surface = self.build()
+            self.key = key
+        return self.surface
+
+    def invalidate(self):
+        self.surface = None
 
-#Composants
 class Component:
-    pass
+    __slots__ = ()
 
 class PositionComponent(Component):
+    #`version` est incrémenté par les systèmes qui écrivent le composant (suivi des changements)
+    __slots__ = ('x', 'y', 'version', 'prev_x', 'prev_y')
+
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
+        self.version = 0
+        #Position au tick précédent, pour l'interpolation du rendu
+        self.prev_x = x
+        self.prev_y = y
 
 class RenderComponent(Component):
+    __slots__ = ('width', 'height', 'color')
+
     def __init__(self, width: int, height: int, color: tuple):
         self.width = width
         self.height = height
         self.color = color
 
 class VelocityComponent(Component):
+    __slots__ = ('dx', 'dy', 'speed', 'version')
+
     def __init__(self, dx: float = 0, dy: float = 0, speed: float = 5.0):
         self.dx = dx
         self.dy = dy
         self.speed = speed
+        self.version = 0
 
 class SpriteComponent(Component):
-    def __init__(self, image_path: str, width: int = None, height: int = None):
-        self.original_image = pygame.image.load(image_path)
-        if width is not None and height is not None:
-            self.original_image = pygame.transform.scale(self.original_image, (width, height))
-        self.image = self.original_image
+    __slots__ = ('atlas', 'angle', 'frame', 'layer', 'version', 'prev_angle')
+
+    def __init__(self, atlas: RotationAtlas, layer: int = LAYER_SPRITE):
+        self.atlas = atlas
         self.angle = 0
+        self.prev_angle = 0
+        self.frame = 0  #Index de l'angle dans l'atlas
+        self.layer = layer
+        self.version = 0
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.atlas.size(self.frame)
+
+    @property
+    def image(self) -> pygame.Surface:
+        return self.atlas.frame(self.frame)
 
 class RotorComponent(Component):
-    def __init__(self, image_path: str, width: int, height: int, parent_width: int):
-        self.original_image = pygame.image.load(image_path)
-        self.original_image = pygame.transform.scale(self.original_image, (width, height))
-        self.image = self.original_image
+    __slots__ = ('atlas', 'angle', 'frame', 'rotation_speed', 'parent_width', 'prev_angle')
+
+    def __init__(self, atlas: RotationAtlas, parent_width: int):
+        self.atlas = atlas
         self.angle = 0
-        self.rotation_speed = 0  #Vitesse de rotation par frame
+        self.prev_angle = 0
+        self.frame = 0
+        self.rotation_speed = 0  #Vitesse de rotation par tick
         self.parent_width = parent_width  #Largeur de l'hélico pour centrer rotor
 
+    @property
+    def image(self) -> pygame.Surface:
+        return self.atlas.frame(self.frame)
+
 class TornadoComponent(Component):
-    def __init__(self, radius: int, speed: float):
+    __slots__ = ('radius', 'speed', 'angle', 'atlas', 'frame', 'prev_angle')
+
+    def __init__(self, radius: int, speed: float, atlas: RotationAtlas):
         self.radius = radius
         self.speed = speed
         self.angle = 0  #Angle de rota actuel
-        self.original_image = pygame.image.load(TORNADO_SPRITE)
-        #Redimensionner l'image pour qu'elle soit un peu plus grande
-        sprite_size = radius * 2.5
-        self.original_image = pygame.transform.scale(self.original_image, (sprite_size, sprite_size))
-        self.image = self.original_image
+        self.prev_angle = 0
+        self.atlas = atlas  #Sprite partagé entre toutes les tornades
+        self.frame = 0
+
+    @property
+    def image(self) -> pygame.Surface:
+        return self.atlas.frame(self.frame)
+
+class ColliderComponent(Component):
+    __slots__ = ('radius', 'layer', 'mask', 'shape')
+
+    def __init__(self, radius: float, layer: int, mask: int = 0, shape: Optional[RotationAtlas] = None):
+        self.radius = radius
+        self.layer = layer  #Couche de cette entité
+        self.mask = mask  #Couches avec lesquelles on cherche les collisions
+        self.shape = shape  #Atlas dont les masques donnent la forme exacte (collisions au pixel)
+
+class CollisionEvent:
+    __slots__ = ('entity', 'other')
+
+    def __init__(self, entity: int, other: int):
+        self.entity = entity  #Entité dont le masque a détecté la collision
+        self.other = other
+
+#Monde (stockage par archetype)
+class Archetype:
+    __slots__ = ('key', 'entities', 'columns', 'rows')
+
+    def __init__(self, key: FrozenSet[str]):
+        self.key = key
+        self.entities: List[int] = []  #Ids des entités, alignés avec les colonnes
+        self.columns: Dict[str, List[Component]] = {name: [] for name in key}
+        self.rows: Dict[int, int] = {}  #Id d'entité -> index de ligne
+
+    def append(self, entity: int, components: Dict[str, Component]):
+        self.rows[entity] = len(self.entities)
+        self.entities.append(entity)
+        for name, component in components.items():
+            self.columns[name].append(component)
+
+    def row_components(self, row: int) -> Dict[str, Component]:
+        return {name: column[row] for name, column in self.columns.items()}
+
+    def swap_remove(self, entity: int):
+        #Déplacer la dernière ligne dans le trou : O(1)
+        row = self.rows.pop(entity)
+        last = self.entities.pop()
+        for column in self.columns.values():
+            moved = column.pop()
+            if last != entity:
+                column[row] = moved
+        if last != entity:
+            self.entities[row] = last
+            self.rows[last] = row
+
+class World:
+    def __init__(self):
+        self.next_id = 0
+        self.archetypes: Dict[FrozenSet[str], Archetype] = {}
+        self.locations: Dict[int, Archetype] = {}
+        self.pending_removals: Dict[int, None] = {}  #Suppressions différées (ordonnées, sans doublon)
+        self.query_cache: Dict[Tuple[FrozenSet[str], FrozenSet[str]], List[Archetype]] = {}
+        self.events: Dict[str, list] = {}  #Événements émis par les systèmes, par type
+        self.resources: Dict[str, object] = {}  #Données globales partagées entre systèmes
+        self.despawn_listeners: List = []  #Appelés avec (id, archetype, ligne) juste avant le retrait d'une entité
+        #Protège les changements de structure quand le Scheduler exécute des systèmes en parallèle
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def spawn(self, **components: Component) -> int:
+        return self.spawn_bundle(components)
+
+    def spawn_bundle(self, components: Dict[str, Component], key: Optional[FrozenSet[str]] = None,
+                     entity: Optional[int] = None) -> int:
+        #Variante sans kwargs : le dict (et sa clé) peuvent être réutilisés par un pool
+        #Un id explicite sert à restaurer un snapshot
+        key = key or frozenset(components)
+        with self.lock:
+            if entity is None:
+                entity = self.next_id
+                self.next_id += 1
+            archetype = self.archetypes.get(key)
+            if archetype is None:
+                archetype = self.create_archetype(key)
+            archetype.append(entity, components)
+            self.locations[entity] = archetype
+        return entity
+
+    def create_archetype(self, key: FrozenSet[str]) -> Archetype:
+        archetype = Archetype(key)
+        self.archetypes[key] = archetype
+        #Nouvel archetype : mettre à jour les requêtes en cache
+        for (required, excluded), matches in self.query_cache.items():
+            if required <= key and not excluded & key:
+                matches.append(archetype)
+        return archetype
+
+    def despawn(self, entity: int):
+        #La suppression est appliquée au prochain flush()
+        if entity in self.locations:
+            with self.lock:
+                self.pending_removals[entity] = None
+
+    def flush(self):
+        listeners = self.despawn_listeners
+        for entity in self.pending_removals:
+            archetype = self.locations.pop(entity, None)
+            if archetype is not None:
+                if listeners:
+                    row = archetype.rows[entity]
+                    for listener in listeners:
+                        listener(entity, archetype, row)
+                archetype.swap_remove(entity)
+        self.pending_removals.clear()
+
+    def clear(self):
+        for archetype in self.archetypes.values():
+            for listener in self.despawn_listeners:
+                for row, entity in enumerate(archetype.entities):
+                    listener(entity, archetype, row)
+            archetype.entities.clear()
+            archetype.rows.clear()
+            for column in archetype.columns.values():
+                column.clear()
+        self.locations.clear()
+        self.pending_removals.clear()
+        for events in self.events.values():
+            events.clear()
+
+    def alive(self, entity: int) -> bool:
+        return entity in self.locations and entity not in self.pending_removals
+
+    def has(self, entity: int, name: str) -> bool:
+        archetype = self.locations.get(entity)
+        return archetype is not None and name in archetype.key
+
+    def get(self, entity: int, name: str) -> Component:
+        archetype = self.locations[entity]
+        return archetype.columns[name][archetype.rows[entity]]
+
+    def matching(self, names: Tuple[str, ...], without: Tuple[str, ...] = ()) -> List[Archetype]:
+        required = frozenset(names)
+        excluded = frozenset(without)
+        matches = self.query_cache.get((required, excluded))
+        if matches is None:
+            with self.lock:
+                matches = [archetype for archetype in self.archetypes.values()
+                           if required <= archetype.key and not excluded & archetype.key]
+                self.query_cache[(required, excluded)] = matches
+        return matches
+
+    def query(self, *names: str, without: Tuple[str, ...] = ()) -> Iterator[tuple]:
+        #Renvoie (id, composant1, composant2, ...) pour les entités qui ont tous les composants
+        for archetype in self.matching(names, without):
+            if archetype.entities:
+                yield from zip(archetype.entities, *(archetype.columns[name] for name in names))
+
+    def count(self, *names: str, without: Tuple[str, ...] = ()) -> int:
+        return sum(len(archetype.entities) for archetype in self.matching(names, without))
+
+    def emit(self, kind: str, event):
+        self.events.setdefault(kind, []).append(event)
+
+    def read(self, kind: str) -> list:
+        return self.events.get(kind, [])
+
+    def clear_events(self, kind: str):
+        events = self.events.get(kind)
+        if events:
+            events.clear()
 
 #Systemes
+class Access:
+    #Accès déclaré d'un système : composants lus/écrits sur les entités qui ont `filter`.
+    #Les noms commençant par '$' désignent des ressources du monde (sans filtre).
+    __slots__ = ('filter', 'reads', 'writes')
+
+    def __init__(self, filter: Tuple[str, ...] = (), reads: Tuple[str, ...] = (), writes: Tuple[str, ...] = ()):
+        self.filter = frozenset(filter)
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+
 class InputSystem:
-    def update(self, entities: List[Entity]):
-        keys = pygame.key.get_pressed()
-        for entity in entities:
-            if 'velocity' in entity.components:
-                vel = entity.components['velocity']
-                vel.dx = 0
-                vel.dy = 0
-                if keys[pygame.K_LEFT]:
-                    vel.dx = -vel.speed
-                if keys[pygame.K_RIGHT]:
-                    vel.dx = vel.speed
-                if keys[pygame.K_UP]:
-                    vel.dy = -vel.speed
-                if keys[pygame.K_DOWN]:
-                    vel.dy = vel.speed
+    access = (Access(reads=('$input',)), Access(filter=('velocity',), writes=('velocity',)))
+
+    def update(self, world: World):
+        keys = world.resources.get('input', 0)
+        for _, vel in world.query('velocity'):
+            dx = 0
+            dy = 0
+            if keys & INPUT_LEFT:
+                dx = -vel.speed
+            if keys & INPUT_RIGHT:
+                dx = vel.speed
+            if keys & INPUT_UP:
+                dy = -vel.speed
+            if keys & INPUT_DOWN:
+                dy = vel.speed
+            #Nouvelle version seulement si la direction change
+            if dx != vel.dx or dy != vel.dy:
+                vel.dx = dx
+                vel.dy = dy
+                vel.version += 1
+
+class RotorSystem:
+    #Rotation des rotors à chaque tick (le rendu interpole entre deux ticks)
+    access = (Access(filter=('rotor',), writes=('rotor',)),)
+
+    def update(self, world: World):
+        for _, rotor in world.query('rotor'):
+            rotor.angle = (rotor.angle + rotor.rotation_speed) % 360
+            rotor.frame = rotor.atlas.index(rotor.angle)
 
 class MovementSystem:
-    def update(self, entities: List[Entity]):
-        for entity in entities:
-            if 'position' in entity.components and 'velocity' in entity.components:
-                pos = entity.components['position']
-                vel = entity.components['velocity']
-                
-                if 'sprite' in entity.components:
-                    sprite = entity.components['sprite']
+    access = (Access(filter=('position', 'velocity', 'sprite'), reads=('velocity',), writes=('position', 'sprite')),)
+
+    def __init__(self):
+        #Cap et déplacement dérivés de la vélocité, recalculés seulement quand elle change
+        #id -> (composant, version de la vélocité, déplacement x, déplacement y, x max, y max)
+        self.headings: Dict[int, tuple] = {}
+
+    def update(self, world: World):
+        headings = self.headings
+        if len(headings) > world.count('position', 'velocity', 'sprite'):
+            #Oublier les entités disparues
+            for entity in [entity for entity in headings if not world.alive(entity)]:
+                del headings[entity]
+        for entity, pos, vel, sprite in world.query('position', 'velocity', 'sprite'):
+            #Rota du sprite en fonction de la direction
+            if vel.dx != 0 or vel.dy != 0:
+                heading = headings.get(entity)
+                if heading is None or heading[0] is not vel or heading[1] != vel.version:
+                    #Calculer l'angle en fonction de la direction
+                    angle = math.degrees(math.atan2(-vel.dy, vel.dx))
+                    sprite.angle = angle
+                    #compenser l'orientation initiale du sprite
+                    frame = sprite.atlas.index(sprite.angle - 90)
+                    if frame != sprite.frame:
+                        sprite.frame = frame
+                        sprite.version += 1
+                    
+                    #Transformer la vélocité en fonction de l'angle actuel
+                    angle_rad = math.radians(sprite.angle)
+                    speed = math.sqrt(vel.dx * vel.dx + vel.dy * vel.dy)
                     
-                    #Rota du sprite en fonction de la direction
-                    if vel.dx != 0 or vel.dy != 0:
-                        #Calculer l'angle en fonction de la direction
-                        angle = math.degrees(math.atan2(-vel.dy, vel.dx))
-                        sprite.angle = angle
-                        #compenser l'orientation initiale du sprite
-                        sprite.image = pygame.transform.rotate(sprite.original_image, sprite.angle - 90)
-                        
-                        #Transformer la vélocité en fonction de l'angle actuel
-                        angle_rad = math.radians(sprite.angle)
-                        speed = math.sqrt(vel.dx * vel.dx + vel.dy * vel.dy)
-                        real_dx = speed * math.cos(angle_rad)
-                        real_dy = -speed * math.sin(angle_rad)
-                        
-                        #Calc la nouvelle position
-                        new_x = pos.x + real_dx
-                        new_y = pos.y + real_dy
-                        
-                        #Obtenir les dimensions du sprite
-                        sprite_width = sprite.image.get_width()
-                        sprite_height = sprite.image.get_height()
-                        
-                        #Vérif et appliquer les limites
-                        new_x = max(0, min(new_x, WINDOW_WIDTH - sprite_width))
-                        new_y = max(0, min(new_y, WINDOW_HEIGHT - sprite_height))
-                        
-                        #Appliquer la pos finale
-                        pos.x = new_x
-                        pos.y = new_y
+                    #Limites selon les dimensions du sprite tourné
+                    sprite_width, sprite_height = sprite.size
+                    heading = headings[entity] = (vel, vel.version, speed * math.cos(angle_rad),
+                                                  -speed * math.sin(angle_rad),
+                                                  WINDOW_WIDTH - sprite_width, WINDOW_HEIGHT - sprite_height)
+                _, _, real_dx, real_dy, max_x, max_y = heading
+                
+                #Calc la nouvelle position et appliquer les limites
+                new_x = max(0, min(pos.x + real_dx, max_x))
+                new_y = max(0, min(pos.y + real_dy, max_y))
+                
+                #Appliquer la pos finale
+                if new_x != pos.x or new_y != pos.y:
+                    pos.x = new_x
+                    pos.y = new_y
+                    pos.version += 1
+
+class RenderQueue:
+    #Commandes de dessin (surface, position) regroupées par couche, envoyées en lot avec Surface.blits
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.layers: Dict[int, List[tuple]] = {}
+        self.submitted = 0
+        self.culled = 0  #Commandes hors écran écartées pendant la frame
+
+    def submit(self, surface: pygame.Surface, position, layer: int):
+        x, y = position
+        if x >= self.width or y >= self.height or x + surface.get_width() <= 0 or y + surface.get_height() <= 0:
+            self.culled += 1
+            return
+        bucket = self.layers.get(layer)
+        if bucket is None:
+            bucket = self.layers[layer] = []
+        bucket.append((surface, position))
+        self.submitted += 1
+
+    def extend(self, blits: List[tuple], layer: int):
+        #Commandes déjà filtrées par l'appelant (champ de tornades vectorisé)
+        bucket = self.layers.get(layer)
+        if bucket is None:
+            bucket = self.layers[layer] = []
+        bucket.extend(blits)
+        self.submitted += len(blits)
+
+    def draw(self, screen: pygame.Surface, dirty: Optional[List[pygame.Rect]] = None):
+        #Tri des couches une seule fois, puis un appel blits() par couche
+        for layer in sorted(self.layers):
+            bucket = self.layers[layer]
+            if not bucket:
+                continue
+            if dirty is not None:
+                dirty.extend(screen.blits(bucket))
+            else:
+                screen.blits(bucket, False)
+            bucket.clear()
+
+    def reset_stats(self):
+        self.submitted = 0
+        self.culled = 0
 
 class RenderSystem:
-    def __init__(self, screen):
+    def __init__(self, screen, dirty_rects: bool = False):
         self.screen = screen
+        self.queue = RenderQueue(screen.get_width(), screen.get_height())
+        #Mode rectangles sales : ne restaurer et n'envoyer que les zones modifiées
+        self.dirty_rects = dirty_rects
+        self.background: Optional[pygame.Surface] = None
+        self.full_redraw = True
+        self.previous_rects: List[pygame.Rect] = []
+        self.current_rects: List[pygame.Rect] = []
+        self.screen_area = screen.get_width() * screen.get_height()
 
-    def update(self, entities: List[Entity]):
-        for entity in entities:
-            if 'position' in entity.components:
-                pos = entity.components['position']
-                
-                #Rendu des tornades
-                if 'tornado' in entity.components:
-                    tornado = entity.components['tornado']
-                    tornado.angle = (tornado.angle + TORNADO_ROTATION_SPEED) % 360
-                    tornado.image = pygame.transform.rotate(tornado.original_image, tornado.angle)
-                    tornado_rect = tornado.image.get_rect(center=(pos.x, pos.y))
-                    self.screen.blit(tornado.image, tornado_rect)
-                
-                #Rendu du sprite de l'hélico
-                if 'sprite' in entity.components:
-                    sprite = entity.components['sprite']
-                    self.screen.blit(sprite.image, (pos.x, pos.y))
+    def invalidate(self):
+        #Forcer un rendu complet à la prochaine frame (overlay, changement d'écran...)
+        self.full_redraw = True
+
+    def begin_frame(self, background: pygame.Surface):
+        if background is not self.background:
+            self.background = background
+            self.full_redraw = True
+        if self.full_redraw or not self.dirty_rects:
+            self.screen.blit(background, (0, 0))
+        else:
+            #Effacer les sprites de la frame précédente avec le fond
+            for rect in self.previous_rects:
+                self.screen.blit(background, rect, rect)
+
+    def submit(self, image: pygame.Surface, position, layer: int):
+        self.queue.submit(image, position, layer)
+
+    def draw_queue(self):
+        self.queue.draw(self.screen, self.current_rects if self.dirty_rects else None)
+
+    def present(self):
+        self.draw_queue()
+        if self.full_redraw or not self.dirty_rects:
+            pygame.display.flip()
+        else:
+            dirty = self.previous_rects + self.current_rects
+            coverage = sum(rect.width * rect.height for rect in dirty)
+            if coverage > self.screen_area * DIRTY_RECT_MAX_COVERAGE:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+        self.full_redraw = False
+        self.previous_rects, self.current_rects = self.current_rects, self.previous_rects
+        self.current_rects.clear()
+
+    def update(self, world: World, alpha: float = 1.0):
+        #`alpha` : fraction du tick en cours écoulée, entre l'état précédent (0) et l'état actuel (1)
+        queue = self.queue
+        for entity, pos, sprite in world.query('position', 'sprite'):
+            #Rendu des sprites (bateau, hélico), la couche vient du composant
+            atlas = sprite.atlas
+            frame = sprite.frame
+            width, height = atlas.size(frame)
+            if alpha >= 1.0:
+                center_x = pos.x + width / 2
+                center_y = pos.y + height / 2
+            else:
+                #Interpoler le centre (la taille de l'image tournée change avec le cap), puis l'angle
+                prev_width, prev_height = width, height
+                if sprite.prev_angle != sprite.angle:
+                    frame = atlas.index(lerp_angle(sprite.prev_angle, sprite.angle, alpha) - 90)
+                    prev_width, prev_height = atlas.size(atlas.index(sprite.prev_angle - 90))
+                center_x = lerp(pos.prev_x + prev_width / 2, pos.x + width / 2, alpha)
+                center_y = lerp(pos.prev_y + prev_height / 2, pos.y + height / 2, alpha)
+                width, height = atlas.size(frame)
+            queue.submit(atlas.frame(frame), (center_x - width / 2, center_y - height / 2), sprite.layer)
+            
+            #Rendu du rotor
+            if world.has(entity, 'rotor'):
+                rotor = world.get(entity, 'rotor')
+                rotor_frame = rotor.frame
+                if alpha < 1.0:
+                    rotor_frame = rotor.atlas.index(lerp_angle(rotor.prev_angle, rotor.angle, alpha))
                 
-                #Rendu du rotor
-                if 'rotor' in entity.components:
-                    rotor = entity.components['rotor']
-                    rotor.angle = (rotor.angle + rotor.rotation_speed) % 360
-                    rotor.image = pygame.transform.rotate(rotor.original_image, rotor.angle)
-                    
-                    #entrer le rotor sur l'hélico
-                    sprite = entity.components['sprite']
-                    rotor_x = pos.x + (sprite.image.get_width() - rotor.image.get_width()) / 2
-                    rotor_y = pos.y + (sprite.image.get_height() - rotor.image.get_height()) / 2
-                    self.screen.blit(rotor.image, (rotor_x, rotor_y))
+                #Centrer le rotor sur l'hélico (tailles gardées par les atlas, sans toucher aux images)
+                rotor_width, rotor_height = rotor.atlas.size(rotor_frame)
+                queue.submit(rotor.atlas.frame(rotor_frame),
+                             (center_x - rotor_width / 2, center_y - rotor_height / 2), LAYER_ROTOR)
+        
+        #Rendu des tornades
+        for _, pos, tornado in world.query('position', 'tornado'):
+            if alpha >= 1.0:
+                tornado_image = tornado.image
+                x, y = pos.x, pos.y
+            else:
+                atlas = tornado.atlas
+                tornado_image = atlas.frame(atlas.index(lerp_angle(tornado.prev_angle, tornado.angle, alpha)))
+                x = lerp(pos.prev_x, pos.x, alpha)
+                y = lerp(pos.prev_y, pos.y, alpha)
+            queue.submit(tornado_image, (x - tornado_image.get_width() / 2,
+                                         y - tornado_image.get_height() / 2), LAYER_TORNADO)
+        
+        #Rendu des tornades vectorisées (mode struct-of-arrays)
+        field = world.resources.get('tornado_field')
+        if field is not None and field.count:
+            self.draw_tornado_field(field, alpha)
+
+    def save_previous_state(self, world: World):
+        #État au début du tick, point de départ de l'interpolation
+        for _, pos in world.query('position'):
+            pos.prev_x = pos.x
+            pos.prev_y = pos.y
+        for _, sprite in world.query('sprite'):
+            sprite.prev_angle = sprite.angle
+        for _, rotor in world.query('rotor'):
+            rotor.prev_angle = rotor.angle
+        for _, tornado in world.query('tornado'):
+            tornado.prev_angle = tornado.angle
+
+    def draw_tornado_field(self, field: 'TornadoField', alpha: float = 1.0):
+        atlas = field.atlas
+        count = field.count
+        #Mouvement linéaire : l'état précédent se déduit de la vitesse, sans colonne supplémentaire
+        behind = 1.0 - alpha
+        angles = field.angle[:count] - TORNADO_ROTATION_SPEED * behind if behind else field.angle[:count]
+        frames = np.rint(angles * (atlas.steps / 360)).astype(np.intp) % atlas.steps
+        xs = field.x[:count].tolist()
+        ys = (field.y[:count] - field.speed[:count] * behind if behind else field.y[:count]).tolist()
+        width, height = self.queue.width, self.queue.height
+        images = {}
+        blits = []
+        culled = 0
+        for frame, x, y in zip(frames.tolist(), xs, ys):
+            entry = images.get(frame)
+            if entry is None:
+                image = atlas.frame(frame)
+                entry = images[frame] = (image, image.get_width() / 2, image.get_height() / 2)
+            image, half_w, half_h = entry
+            #Hors écran : ne pas envoyer la commande
+            if x + half_w <= 0 or x - half_w >= width or y + half_h <= 0 or y - half_h >= height:
+                culled += 1
+                continue
+            blits.append((image, (x - half_w, y - half_h)))
+        self.queue.culled += culled
+        self.queue.extend(blits, LAYER_TORNADO)
+
+class SpatialHash:
+    def __init__(self, cell_size: int = COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+    def cell_range(self, x: float, y: float, radius: float) -> Iterator[Tuple[int, int]]:
+        size = self.cell_size
+        min_cx, max_cx = int((x - radius) // size), int((x + radius) // size)
+        min_cy, max_cy = int((y - radius) // size), int((y + radius) // size)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                yield cx, cy
+
+    def insert_cells(self, item: int, cells: tuple):
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                bucket = self.cells[cell] = []
+            bucket.append(item)
+
+    def remove_cells(self, item: int, cells: tuple):
+        for cell in cells:
+            self.cells[cell].remove(item)
+
+    def query(self, x: float, y: float, radius: float) -> set:
+        found = set()
+        for cell in self.cell_range(x, y, radius):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+def lerp(start: float, end: float, alpha: float) -> float:
+    return start + (end - start) * alpha
+
+def lerp_angle(start: float, end: float, alpha: float) -> float:
+    #Interpolation par le plus court chemin (359° -> 1° passe par 0°)
+    return start + ((end - start + 180) % 360 - 180) * alpha
+
+def sprite_center(pos: PositionComponent, sprite: SpriteComponent) -> Tuple[float, float]:
+    #Les sprites sont positionnés par le coin haut-gauche de l'image actuelle
+    width, height = sprite.size
+    return pos.x + width / 2, pos.y + height / 2
+
+def shape_frame(world: World, entity: int) -> int:
+    #Index de l'angle affiché : les sprites et les tornades gardent leur propre frame
+    if world.has(entity, 'sprite'):
+        return world.get(entity, 'sprite').frame
+    return world.get(entity, 'tornado').frame
+
+def shapes_overlap(shape: RotationAtlas, frame: int, x: float, y: float,
+                   other_shape: RotationAtlas, other_frame: int, other_x: float, other_y: float) -> bool:
+    #Test au pixel près entre deux images centrées en (x, y), avec les masques en cache dans les atlas
+    width, height = shape.size(frame)
+    other_width, other_height = other_shape.size(other_frame)
+    offset = (round((other_x - other_width / 2) - (x - width / 2)),
+              round((other_y - other_height / 2) - (y - height / 2)))
+    return shape.mask(frame).overlap(other_shape.mask(other_frame), offset) is not None
+
+class ColliderState:
+    #Ce que la grille sait d'un collider, et les versions des composants d'où ça vient
+    __slots__ = ('position', 'position_version', 'sprite_version', 'x', 'y', 'radius', 'layer', 'mask',
+                 'shape', 'bounds', 'cells', 'seen')
+
+    def __init__(self, position: PositionComponent, collider: 'ColliderComponent', pixel_perfect: bool = False):
+        self.position = position
+        self.position_version = -1
+        self.sprite_version = -1
+        self.x = 0.0
+        self.y = 0.0
+        #Au pixel près, le cercle doit contenir toute l'image pour ne rater aucun contact
+        self.shape = collider.shape if pixel_perfect else None
+        self.radius = collider.radius if self.shape is None else self.shape.radius
+        self.layer = collider.layer
+        self.mask = collider.mask
+        self.bounds: tuple = ()  #Cellules min/max couvertes
+        self.cells: tuple = ()
+        self.seen = 0  #Dernier passage où l'entité existait encore
+
+class CollisionSystem:
+    access = (Access(filter=('position', 'collider'), reads=('position', 'sprite', 'tornado', 'collider')),
+              Access(writes=('$collision',)))
+
+    def __init__(self, cell_size: int = COLLISION_CELL_SIZE, pixel_perfect: bool = False):
+        #Mode au pixel près : les masques ne sont testés que si les cercles englobants se touchent
+        self.pixel_perfect = pixel_perfect
+        #Grille persistante : un collider n'est déplacé que si sa position ou son sprite a changé
+        #et qu'il a changé de cellules
+        self.grid = SpatialHash(cell_size)
+        self.states: Dict[int, ColliderState] = {}
+        self.sensors: Dict[int, ColliderState] = {}  #Colliders qui ont un masque (testés en narrow phase)
+        self.passes = 0
+
+    def track(self, entity: int, pos: PositionComponent, sprite_version: int, collider: 'ColliderComponent',
+              x: float, y: float):
+        grid = self.grid
+        state = self.states.get(entity)
+        if state is None or state.position is not pos:
+            if state is not None:
+                grid.remove_cells(entity, state.cells)
+            state = self.states[entity] = ColliderState(pos, collider, self.pixel_perfect)
+            if state.mask:
+                self.sensors[entity] = state
+            else:
+                self.sensors.pop(entity, None)
+        state.position_version = pos.version
+        state.sprite_version = sprite_version
+        state.x = x
+        state.y = y
+        #La plupart des déplacements restent dans les mêmes cellules
+        size = grid.cell_size
+        radius = state.radius
+        bounds = (int((x - radius) // size), int((x + radius) // size),
+                  int((y - radius) // size), int((y + radius) // size))
+        if bounds != state.bounds:
+            grid.remove_cells(entity, state.cells)
+            state.cells = tuple(grid.cell_range(x, y, radius))
+            grid.insert_cells(entity, state.cells)
+            state.bounds = bounds
+        return state
+
+    def update(self, world: World):
+        world.clear_events('collision')
+        states = self.states
+        self.passes += 1
+        passes = self.passes
+        
+        #Broad phase : seuls les colliders modifiés depuis le dernier passage sont recalculés
+        for entity, pos, sprite, collider in world.query('position', 'sprite', 'collider'):
+            state = states.get(entity)
+            if (state is None or state.position is not pos or state.position_version != pos.version
+                    or state.sprite_version != sprite.version):
+                center_x, center_y = sprite_center(pos, sprite)
+                state = self.track(entity, pos, sprite.version, collider, center_x, center_y)
+            state.seen = passes
+        for entity, pos, collider in world.query('position', 'collider', without=('sprite',)):
+            state = states.get(entity)
+            if state is None or state.position is not pos or state.position_version != pos.version:
+                state = self.track(entity, pos, -1, collider, pos.x, pos.y)
+            state.seen = passes
+        #Retirer de la grille les entités disparues
+        if len(states) > world.count('position', 'collider'):
+            for entity in [entity for entity, state in states.items() if state.seen != passes]:
+                self.grid.remove_cells(entity, states.pop(entity).cells)
+                self.sensors.pop(entity, None)
+        
+        #Narrow phase cercle/cercle, uniquement pour les colliders qui ont un masque
+        for entity, state in self.sensors.items():
+            mask = state.mask
+            x, y, radius = state.x, state.y, state.radius
+            for other in self.grid.query(x, y, radius):
+                if other == entity:
+                    continue
+                other_state = states[other]
+                if not mask & other_state.layer:
+                    continue
+                dx = x - other_state.x
+                dy = y - other_state.y
+                reach = radius + other_state.radius
+                if dx * dx + dy * dy >= reach * reach:
+                    continue
+                if (state.shape is not None and other_state.shape is not None
+                        and not shapes_overlap(state.shape, shape_frame(world, entity), x, y,
+                                               other_state.shape, shape_frame(world, other),
+                                               other_state.x, other_state.y)):
+                    continue
+                world.emit('collision', CollisionEvent(entity, other))
+
+class TornadoField:
+    #Tornades en struct-of-arrays : une colonne NumPy par attribut
+    def __init__(self, atlas: RotationAtlas, capacity: int = 256):
+        if np is None:
+            raise RuntimeError("NumPy is required for vectorized tornadoes")
+        self.atlas = atlas
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.radius = np.zeros(capacity, dtype=np.float64)
+        self.angle = np.zeros(capacity, dtype=np.float64)
+
+    def columns(self) -> Tuple:
+        return self.x, self.y, self.speed, self.radius, self.angle
+
+    def clear(self):
+        self.count = 0
+
+    def grow(self):
+        capacity = len(self.x) * 2
+        for name in ('x', 'y', 'speed', 'radius', 'angle'):
+            column = np.zeros(capacity, dtype=np.float64)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def spawn(self, x: float, y: float, radius: float, speed: float):
+        if self.count == len(self.x):
+            self.grow()
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.radius[index] = radius
+        self.speed[index] = speed
+        self.angle[index] = 0
+        self.count += 1
+
+    def step(self, rotation_speed: float):
+        count = self.count
+        self.y[:count] += self.speed[:count]
+        angle = self.angle[:count]
+        angle += rotation_speed
+        np.remainder(angle, 360, out=angle)
+
+    def cull(self, limit: float) -> int:
+        #Supprimer les tornades sorties de l'écran par swap-remove vectorisé
+        count = self.count
+        dead = np.flatnonzero(self.y[:count] > limit)
+        if not len(dead):
+            return 0
+        new_count = count - len(dead)
+        #Trous à combler dans la partie conservée, et survivants de la queue pour les combler
+        holes = dead[dead < new_count]
+        alive_tail = np.arange(new_count, count)
+        alive_tail = alive_tail[self.y[new_count:count] <= limit]
+        for column in self.columns():
+            column[holes] = column[alive_tail]
+        self.count = new_count
+        return len(dead)
+
+    def frames(self, indices) -> List[int]:
+        #Index d'atlas des tornades, arrondis comme au rendu
+        steps = self.atlas.steps
+        return (np.rint(self.angle[indices] * (steps / 360)).astype(np.intp) % steps).tolist()
+
+    def overlapping(self, x: float, y: float, reach: float):
+        #Tornades dont le centre est à moins de `reach` du point
+        count = self.count
+        dx = self.x[:count] - x
+        dy = self.y[:count] - y
+        return np.flatnonzero(dx * dx + dy * dy < reach * reach)
+
+    def hits(self, x: float, y: float, radius: float) -> bool:
+        count = self.count
+        dx = self.x[:count] - x
+        dy = self.y[:count] - y
+        reach = self.radius[:count] + radius
+        return bool(np.any(dx * dx + dy * dy < reach * reach))
+
+class TornadoPool:
+    #Free list de composants de tornades : recyclés au despawn, réinitialisés au spawn
+    KEY = frozenset(('position', 'tornado', 'render', 'collider'))
+
+    def __init__(self, atlas: RotationAtlas, capacity: int = TORNADO_POOL_SIZE):
+        self.atlas = atlas
+        self.capacity = capacity
+        self.free: List[Dict[str, Component]] = []
+        #Dicts déjà copiés dans le monde par spawn(), réutilisés au despawn pour ne pas en allouer
+        self.spare: List[Dict[str, Component]] = []
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0  #Tornades rendues alors que le pool était plein
+
+    def acquire(self, x: float, y: float) -> Dict[str, Component]:
+        if self.free:
+            self.hits += 1
+            components = self.free.pop()
+            pos = components['position']
+            pos.x = pos.prev_x = x
+            pos.y = pos.prev_y = y
+            pos.version += 1
+            tornado = components['tornado']
+            tornado.radius = TORNADO_RADIUS
+            tornado.speed = TORNADO_SPEED
+            tornado.angle = tornado.prev_angle = 0
+            tornado.frame = 0
+            return components
+        self.misses += 1
+        return {
+            'position': PositionComponent(x, y),
+            'tornado': TornadoComponent(TORNADO_RADIUS, TORNADO_SPEED, self.atlas),
+            'render': RenderComponent(TORNADO_RADIUS * 2, TORNADO_RADIUS * 2, BLUE),
+            'collider': ColliderComponent(TORNADO_RADIUS, COLLISION_LAYER_TORNADO, shape=self.atlas),
+        }
+
+    def spawn(self, world: 'World', x: float, y: float, entity: Optional[int] = None) -> Dict[str, Component]:
+        components = self.acquire(x, y)
+        world.spawn_bundle(components, self.KEY, entity)
+        #Le monde a copié les composants dans ses colonnes : le dict redevient libre
+        if len(self.spare) < self.capacity:
+            self.spare.append(components)
+        return components
+
+    def release(self, entity: int, archetype: 'Archetype', row: int):
+        if 'tornado' not in archetype.key:
+            return
+        if len(self.free) >= self.capacity:
+            self.dropped += 1
+            return
+        components = self.spare.pop() if self.spare else {}
+        for name, column in archetype.columns.items():
+            components[name] = column[row]
+        self.free.append(components)
+
+class DifficultySystem:
+    #Le taux de spawn ne dépend que de game_timer : inutile de le recalculer à chaque tick
+    access = (Access(reads=('$game_timer',), writes=('$spawn_rate',)),)
+
+    def update(self, world: World):
+        game_timer = world.resources.get('game_timer', 0)
+        world.resources['spawn_rate'] = max(
+            TORNADO_SPAWN_RATE_MIN,
+            TORNADO_SPAWN_RATE_INITIAL - (game_timer // DIFFICULTY_INCREASE_INTERVAL) * 5
+        )
 
 class TornadoSystem:
-    def __init__(self):
+    def __init__(self, assets: AssetCache, vectorized: bool = False, rng: Optional[random.Random] = None,
+                 pool_size: int = TORNADO_POOL_SIZE, pixel_perfect: bool = False):
+        self.rng = rng or random.Random()  #Injectable et seedé pour des parties reproductibles
         self.spawn_counter = 0
         self.current_spawn_rate = TORNADO_SPAWN_RATE_INITIAL
+        #Redimensionner l'image pour qu'elle soit un peu plus grande
+        self.atlas = assets.atlas(TORNADO_SPRITE, (TORNADO_SPRITE_SIZE, TORNADO_SPRITE_SIZE))
+        #Mode struct-of-arrays optionnel (NumPy)
+        self.field = TornadoField(self.atlas) if vectorized else None
+        self.pool = TornadoPool(self.atlas, pool_size)
+        self.field_hit = False
+        self.spawned = 0  #Tornades créées depuis le début de la partie
+        self.pixel_perfect = pixel_perfect  #Test au pixel près pour le champ vectorisé
+        self.access = [Access(reads=('$spawn_rate',)),
+                       Access(filter=('position', 'tornado'), reads=('tornado',), writes=('position', 'tornado'))]
+        if self.field is not None:
+            #Le test de distance vectorisé lit la position de l'hélico
+            self.access += [Access(writes=('$tornado_field',)),
+                            Access(filter=('position', 'sprite', 'collider'), reads=('position', 'sprite', 'collider'))]
     
-    def update(self, entities: List[Entity], game_timer: int) -> Optional[bool]:
-        #Ajuster la diff en fonction du temps
-        self.current_spawn_rate = max(
-            TORNADO_SPAWN_RATE_MIN,
-            TORNADO_SPAWN_RATE_INITIAL - (game_timer // DIFFICULTY_INCREASE_INTERVAL) * 5
-        )
+    def update(self, world: World):
+        #Taux de spawn calculé par le DifficultySystem
+        self.current_spawn_rate = world.resources.get('spawn_rate', TORNADO_SPAWN_RATE_INITIAL)
+        
+        if self.field is not None:
+            self.update_field(world)
         
         #Déplacer les tornades existantes
-        for entity in entities:
-            if 'tornado' in entity.components and 'position' in entity.components:
-                pos = entity.components['position']
-                tornado = entity.components['tornado']
-                
-                #Tornade vers le bas
-                pos.y += tornado.speed
-                
-                #Vérif les collisions avec l'hélico
-                for other in entities:
-                    if 'sprite' in other.components and 'position' in other.components:
-                        heli_pos = other.components['position']
-                        heli_sprite = other.components['sprite']
-                        
-                        #Utiliser l'image actuelle pour le centre
-                        heli_center_x = heli_pos.x + heli_sprite.image.get_width() / 2
-                        heli_center_y = heli_pos.y + heli_sprite.image.get_height() / 2
-                        
-                        #Utiliser l'image originale pour le rayon de la hitbox
-                        hitbox_radius = min(heli_sprite.original_image.get_width(), 
-                                          heli_sprite.original_image.get_height()) / 2
-                        
-                        distance = math.sqrt((pos.x - heli_center_x)**2 + (pos.y - heli_center_y)**2)
-                        
-                        if distance < tornado.radius + hitbox_radius:
-                            return True
-                
-                #Supprimer les tornades qui sortent
-                if pos.y > WINDOW_HEIGHT:
-                    entities.remove(entity)
+        for entity, pos, tornado in world.query('position', 'tornado'):
+            #Tornade vers le bas
+            pos.y += tornado.speed
+            pos.version += 1
+            #La rotation fait partie de la simulation : elle donne la forme exacte de la tornade
+            tornado.angle = (tornado.angle + TORNADO_ROTATION_SPEED) % 360
+            tornado.frame = tornado.atlas.index(tornado.angle)
+            
+            #Supprimer les tornades qui sortent (appliqué au flush du monde)
+            if pos.y > WINDOW_HEIGHT:
+                world.despawn(entity)
         
         #Spawn de nouvelles tornades avec le taux actualisé
         self.spawn_counter += 1
         if self.spawn_counter >= self.current_spawn_rate:
             self.spawn_counter = 0
-            self.spawn_tornado(entities)
+            self.spawn_tornado(world)
+    
+    def update_field(self, world: World):
+        field = self.field
+        world.resources['tornado_field'] = field
+        field.step(TORNADO_ROTATION_SPEED)
         
+        #Test de distance groupé contre chaque hélico
+        self.field_hit = False
+        for _, pos, sprite, collider in world.query('position', 'sprite', 'collider'):
+            if collider.mask & COLLISION_LAYER_TORNADO:
+                center_x, center_y = sprite_center(pos, sprite)
+                if self.pixel_perfect and collider.shape is not None:
+                    if self.field_shapes_hit(field, collider.shape, sprite.frame, center_x, center_y):
+                        self.field_hit = True
+                elif field.hits(center_x, center_y, collider.radius):
+                    self.field_hit = True
+        
+        field.cull(WINDOW_HEIGHT)
+    
+    def field_shapes_hit(self, field: 'TornadoField', shape: RotationAtlas, frame: int, x: float, y: float) -> bool:
+        #Cercles englobants en vectorisé, puis masques seulement pour les tornades proches
+        candidates = field.overlapping(x, y, shape.radius + field.atlas.radius)
+        if not len(candidates):
+            return False
+        for index, tornado_frame in zip(candidates.tolist(), field.frames(candidates)):
+            if shapes_overlap(shape, frame, x, y, field.atlas, tornado_frame, field.x[index], field.y[index]):
+                return True
         return False
+
+    def tornado_count(self, world: World) -> int:
+        count = world.count('tornado')
+        if self.field is not None:
+            count += self.field.count
+        return count
     
-    def spawn_tornado(self, entities: List[Entity]):
-        tornado = Entity()
+    def reset(self):
+        self.spawn_counter = 0
+        self.current_spawn_rate = TORNADO_SPAWN_RATE_INITIAL
+        self.field_hit = False
+        self.spawned = 0
+        if self.field is not None:
+            self.field.clear()
+    
+    def hit_player(self, world: World) -> bool:
+        if self.field_hit:
+            return True
+        #Consommer les collisions émises par le CollisionSystem
+        for event in world.read('collision'):
+            if world.has(event.other, 'tornado'):
+                return True
+        return False
+    
+    def spawn_tornado(self, world: World):
         #Pos aléatoire en haut de l'écran
-        x = random.randint(TORNADO_RADIUS, WINDOW_WIDTH - TORNADO_RADIUS)
-        tornado.components['position'] = PositionComponent(x, -TORNADO_RADIUS)
-        tornado.components['tornado'] = TornadoComponent(TORNADO_RADIUS, TORNADO_SPEED)
-        tornado.components['render'] = RenderComponent(TORNADO_RADIUS * 2, TORNADO_RADIUS * 2, BLUE)
-        entities.append(tornado)
+        x = self.rng.randint(TORNADO_RADIUS, WINDOW_WIDTH - TORNADO_RADIUS)
+        self.spawned += 1
+        if self.field is not None:
+            self.field.spawn(x, -TORNADO_RADIUS, TORNADO_RADIUS, TORNADO_SPEED)
+            return
+        self.pool.spawn(world, x, -TORNADO_RADIUS)
+
+#Ordonnancement des systèmes
+class ScheduledSystem:
+    __slots__ = ('name', 'system', 'every', 'access')
+
+    def __init__(self, name: str, system, every: int):
+        self.name = name
+        self.system = system
+        self.every = every  #Exécuté un tick sur `every`
+        self.access = system.access
+
+class Scheduler:
+    def __init__(self, world: World, profiler: Optional['FrameProfiler'] = None, parallel: bool = False,
+                 max_workers: Optional[int] = None):
+        self.world = world
+        self.profiler = profiler
+        self.systems: List[ScheduledSystem] = []
+        self.stages: List[List[ScheduledSystem]] = []
+        self.built_for = -1  #Nb d'archetypes lors de la dernière construction du graphe
+        #Pool de threads pour les systèmes d'une même étape qui ne sont pas en conflit, créé au premier besoin
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def add(self, name: str, system, every: int = 1):
+        self.systems.append(ScheduledSystem(name, system, every))
+        self.built_for = -1
+
+    def conflicts(self, first: ScheduledSystem, second: ScheduledSystem) -> bool:
+        archetypes = self.world.archetypes
+        for a in first.access:
+            for b in second.access:
+                shared = (a.writes & (b.reads | b.writes)) | (b.writes & a.reads)
+                for name in shared:
+                    if name.startswith('$'):
+                        return True
+                    #Conflit seulement si une même entité peut être vue par les deux accès
+                    required = a.filter | b.filter | {name}
+                    if any(required <= key for key in archetypes):
+                        return True
+        return False
+
+    def build(self):
+        #Chaque système va dans l'étape qui suit la dernière étape d'un système en conflit déclaré avant lui
+        stages: List[List[ScheduledSystem]] = []
+        placed: List[Tuple[ScheduledSystem, int]] = []
+        for system in self.systems:
+            stage = 0
+            for other, other_stage in placed:
+                if self.conflicts(system, other):
+                    stage = max(stage, other_stage + 1)
+            if stage == len(stages):
+                stages.append([])
+            stages[stage].append(system)
+            placed.append((system, stage))
+        self.stages = stages
+        self.built_for = len(self.world.archetypes)
+
+    def run_system(self, scheduled: ScheduledSystem):
+        if self.profiler is None:
+            scheduled.system.update(self.world)
+        else:
+            with self.profiler.section(scheduled.name):
+                scheduled.system.update(self.world)
+
+    def run(self, tick: int):
+        #Un nouvel archetype peut créer ou lever des conflits
+        if self.built_for != len(self.world.archetypes):
+            self.build()
+        for stage in self.stages:
+            due = [scheduled for scheduled in stage if tick % scheduled.every == 0]
+            if self.parallel and len(due) > 1:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(self.max_workers)
+                for future in [self.executor.submit(self.run_system, scheduled) for scheduled in due]:
+                    future.result()
+            else:
+                for scheduled in due:
+                    self.run_system(scheduled)
+
+    def shutdown(self):
+        #Arrêter les threads ; un prochain run() en recrée si besoin
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+#Profilage intégré
+PROFILER_WINDOW = 300  #Frames gardées pour les percentiles glissants
+PROFILER_OVERLAY_REFRESH = 15  #Le texte de l'overlay n'est re-rendu que toutes les N frames
+
+class ProfilerSection:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter_ns() - self.start
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0) + elapsed
+
+class NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+NULL_SECTION = NullSection()
+
+class FrameProfiler:
+    def __init__(self, enabled: bool = True, window: int = PROFILER_WINDOW, keep_history: bool = False):
+        self.enabled = enabled
+        self.window = window
+        self.keep_history = keep_history  #Garder toutes les frames pour l'export CSV/JSON
+        self.sections: Dict[str, ProfilerSection] = {}
+        self.samples: Dict[str, deque] = {}  #Durées (ns) des dernières frames, par section
+        self.frame: Dict[str, int] = {}  #Durées de la frame en cours
+        self.frame_start = time.perf_counter_ns()
+        self.frame_count = 0
+        self.allocations_start = surface_allocations.total
+        self.last_counts: Dict[str, int] = {}
+        self.history: List[Dict[str, int]] = []
+
+    def section(self, name: str):
+        if not self.enabled:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = ProfilerSection(self, name)
+        return section
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+        self.allocations_start = surface_allocations.total
+
+    def end_frame(self, **counts: int):
+        now = time.perf_counter_ns()
+        if self.enabled:
+            frame = self.frame
+            frame['frame'] = now - self.frame_start
+            for name, elapsed in frame.items():
+                samples = self.samples.get(name)
+                if samples is None:
+                    samples = self.samples[name] = deque(maxlen=self.window)
+                samples.append(elapsed)
+            counts['allocations'] = surface_allocations.total - self.allocations_start
+            self.last_counts = counts
+            if self.keep_history:
+                row = dict(frame)
+                row.update(counts)
+                row['index'] = self.frame_count
+                self.history.append(row)
+            self.frame_count += 1
+        self.frame = {}
+        self.allocations_start = surface_allocations.total
+        self.frame_start = now
+
+    def percentiles(self, name: str) -> Tuple[float, float, float]:
+        #p50/p95/p99 en millisecondes sur la fenêtre glissante
+        samples = self.samples.get(name)
+        if not samples:
+            return 0.0, 0.0, 0.0
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(fraction * len(ordered)))] / 1e6 for fraction in (0.5, 0.95, 0.99))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name in self.samples:
+            p50, p95, p99 = self.percentiles(name)
+            result[name] = {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+        return result
+
+    def report_lines(self) -> List[str]:
+        lines = []
+        for name in self.samples:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<10} p50 {p50:6.2f}  p95 {p95:6.2f}  p99 {p99:6.2f} ms")
+        lines.append("  ".join(f"{name} {count}" for name, count in self.last_counts.items()))
+        return lines
+
+    def export(self, path: str):
+        #Format choisi selon l'extension : .csv ou .json
+        if path.endswith('.csv'):
+            columns = ['index'] + list(self.samples)
+            columns += [name for name in self.last_counts if name not in columns]
+            with open(path, 'w', newline='') as output:
+                writer = csv.DictWriter(output, fieldnames=columns, restval=0, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self.history)
+        else:
+            with open(path, 'w') as output:
+                json.dump({'frames': self.frame_count, 'summary': self.summary(), 'history': self.history},
+                          output, indent=2)
+
+class AllocationCounter:
+    def __init__(self):
+        self.total = 0
+
+    def add(self, count: int = 1):
+        #Appelé aux endroits où le jeu crée des Surfaces (chargement, rotation, texte, écrans)
+        self.total += count
+
+surface_allocations = AllocationCounter()
+
+#Sources d'entrée : renvoient un masque INPUT_* par tick de simulation
+class KeyboardInput:
+    def read(self) -> int:
+        keys = pygame.key.get_pressed()
+        mask = 0
+        if keys[pygame.K_LEFT]:
+            mask |= INPUT_LEFT
+        if keys[pygame.K_RIGHT]:
+            mask |= INPUT_RIGHT
+        if keys[pygame.K_UP]:
+            mask |= INPUT_UP
+        if keys[pygame.K_DOWN]:
+            mask |= INPUT_DOWN
+        return mask
+
+class RandomInput:
+    def __init__(self, seed: Optional[int] = None, min_hold: int = 10, max_hold: int = 40):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.mask = 0
+        self.remaining = 0
+
+    def read(self) -> int:
+        #Garder une direction aléatoire pendant quelques ticks, comme un joueur
+        if self.remaining <= 0:
+            self.mask = self.rng.randrange(16)
+            self.remaining = self.rng.randint(self.min_hold, self.max_hold)
+        self.remaining -= 1
+        return self.mask
+
+class ScriptedInput:
+    def __init__(self, script: List[Tuple[int, int]], loop: bool = False):
+        #script : liste de (masque, nombre de ticks)
+        self.masks = [mask for mask, ticks in script for _ in range(ticks)]
+        self.loop = loop
+        self.tick = 0
+
+    def read(self) -> int:
+        if not self.masks:
+            return 0
+        tick = self.tick
+        self.tick += 1
+        if tick >= len(self.masks):
+            if not self.loop:
+                return 0
+            tick %= len(self.masks)
+        return self.masks[tick]
+
+#Enregistrement / replay des entrées
+REPLAY_MAGIC = b'BXRP'
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct('<4sBBQI')  #magic, version, flags, seed, ticks
+REPLAY_FLAG_VECTORIZED = 1
+REPLAY_FLAG_PIXEL_COLLISIONS = 2
+
+class Replay:
+    def __init__(self, seed: int, flags: int = 0, masks: Optional[bytearray] = None):
+        self.seed = seed
+        self.flags = flags
+        self.masks = masks if masks is not None else bytearray()  #Un masque INPUT_* par tick
+
+    def runs(self) -> List[Tuple[int, int]]:
+        runs = []
+        for mask in self.masks:
+            if runs and runs[-1][0] == mask:
+                runs[-1][1] += 1
+            else:
+                runs.append([mask, 1])
+        return [(mask, ticks) for mask, ticks in runs]
+
+    def encode(self) -> bytes:
+        #Chaque run : masque sur 4 bits + longueur sur 4 bits (0 = longueur en varint à la suite)
+        data = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.flags, self.seed, len(self.masks)))
+        for mask, ticks in self.runs():
+            if ticks < 16:
+                data.append(mask | ticks << 4)
+                continue
+            data.append(mask)
+            while True:
+                byte = ticks & 0x7F
+                ticks >>= 7
+                if ticks:
+                    data.append(byte | 0x80)
+                else:
+                    data.append(byte)
+                    break
+        return bytes(data)
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'Replay':
+        magic, version, flags, seed, total = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("not a Bermuda Explorer replay (or unsupported version)")
+        masks = bytearray()
+        offset = REPLAY_HEADER.size
+        while offset < len(data):
+            byte = data[offset]
+            offset += 1
+            mask, ticks = byte & 0x0F, byte >> 4
+            if not ticks:
+                shift = 0
+                while True:
+                    byte = data[offset]
+                    offset += 1
+                    ticks |= (byte & 0x7F) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+            masks.extend(bytes((mask,)) * ticks)
+        if len(masks) != total:
+            raise ValueError(f"corrupted replay: {len(masks)} ticks decoded, {total} expected")
+        return cls(seed, flags, masks)
+
+    def save(self, path: str):
+        with open(path, 'wb') as output:
+            output.write(self.encode())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as replay_file:
+            return cls.decode(replay_file.read())
+
+class ReplayInput(ScriptedInput):
+    def __init__(self, replay: Replay):
+        super().__init__(replay.runs())
+
+#Snapshots binaires du monde (restart depuis un checkpoint, post-mortem, envoi aux workers)
+SNAPSHOT_MAGIC = b'BXSN'
+SNAPSHOT_VERSION = 1
+#magic, version, flags, tick, game_timer, spawn_counter, spawned, next_id, id de l'hélico (-1 : aucun), nb de tornades
+SNAPSHOT_HEADER = struct.Struct('<4sBBIIIIIqI')
+#x, y, dx, dy, vitesse, angle, angle du rotor, vitesse du rotor, frame, frame du rotor
+SNAPSHOT_PLAYER = struct.Struct('<8d2i')
+SNAPSHOT_RNG = struct.Struct('<Id')  #version de l'état, gauss_next (suivi de 625 uint32)
+SNAPSHOT_RNG_STATE = struct.Struct('<625I')
+#Par tornade, en trois blocs consécutifs : ids, valeurs (x, y, rayon, vitesse, angle), frames
+SNAPSHOT_TORNADO_ID = struct.Struct('<q')
+SNAPSHOT_TORNADO_VALUES = struct.Struct('<5d')
+SNAPSHOT_TORNADO_FRAME = struct.Struct('<i')
+SNAPSHOT_FIELD_COUNT = struct.Struct('<I')
+SNAPSHOT_SLOT_SIZE = 4096  #Taille initiale des slots du ring (une vingtaine de tornades), agrandis si besoin
+SNAPSHOT_FLAG_GAME_OVER = 1
+SNAPSHOT_FLAG_FIELD = 2
+SNAPSHOT_FLAG_FIELD_HIT = 4
+SNAPSHOT_FLAG_GAUSS = 8
+SNAPSHOT_TORNADO_FIELDS = 5  #x, y, rayon, vitesse, angle
+REWIND_CAPACITY = 5 * FPS  #Ticks gardés pour le rewind en fenêtré
+
+class WorldSnapshot:
+    __slots__ = ('flags', 'tick', 'game_timer', 'spawn_counter', 'spawned', 'next_id', 'helicopter',
+                 'player', 'rng_state', 'tornado_ids', 'tornado_values', 'tornado_frames', 'field')
 
-class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Bermuda Explorer")
+        self.flags = 0
+        self.tick = 0
+        self.game_timer = 0
+        self.spawn_counter = 0
+        self.spawned = 0
+        self.next_id = 0
+        self.helicopter = -1
+        self.player: Optional[tuple] = None
+        self.rng_state: Optional[tuple] = None
+        self.tornado_ids = array('q')
+        self.tornado_values = array('d')  #SNAPSHOT_TORNADO_FIELDS valeurs par tornade
+        self.tornado_frames = array('i')
+        self.field: Optional[List[array]] = None  #Colonnes du TornadoField en mode vectorisé
+
+    @staticmethod
+    def capture(game: 'Game') -> bytes:
+        buffer = bytearray()
+        WorldSnapshot.capture_into(game, buffer)
+        return bytes(buffer)
+
+    @staticmethod
+    def capture_into(game: 'Game', buffer: bytearray) -> int:
+        #Écrit le snapshot au début de `buffer` (agrandi seulement s'il est trop petit), renvoie sa taille
+        world = game.world
+        tornado_system = game.tornado_system
+        field = tornado_system.field
+        helicopter = game.helicopter if game.helicopter is not None and world.alive(game.helicopter) else -1
+        flags = SNAPSHOT_FLAG_GAME_OVER if game.game_over else 0
+        if tornado_system.field_hit:
+            flags |= SNAPSHOT_FLAG_FIELD_HIT
+        if field is not None:
+            flags |= SNAPSHOT_FLAG_FIELD
+        rng_version, internal, gauss = game.rng.getstate()
+        if gauss is not None:
+            flags |= SNAPSHOT_FLAG_GAUSS
+        archetypes = world.matching(('position', 'tornado'))
+        tornadoes = sum(len(archetype.entities) for archetype in archetypes)
+        size = (SNAPSHOT_HEADER.size + SNAPSHOT_RNG.size + SNAPSHOT_RNG_STATE.size
+                + tornadoes * (SNAPSHOT_TORNADO_ID.size + SNAPSHOT_TORNADO_VALUES.size + SNAPSHOT_TORNADO_FRAME.size))
+        if helicopter >= 0:
+            size += SNAPSHOT_PLAYER.size
+        if field is not None:
+            size += SNAPSHOT_FIELD_COUNT.size + SNAPSHOT_TORNADO_FIELDS * field.count * 8
+        if len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+        
+        SNAPSHOT_HEADER.pack_into(buffer, 0, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, game.tick, game.game_timer,
+                                  tornado_system.spawn_counter, tornado_system.spawned, world.next_id,
+                                  helicopter, tornadoes)
+        offset = SNAPSHOT_HEADER.size
+        SNAPSHOT_RNG.pack_into(buffer, offset, rng_version, gauss or 0.0)
+        offset += SNAPSHOT_RNG.size
+        SNAPSHOT_RNG_STATE.pack_into(buffer, offset, *internal)
+        offset += SNAPSHOT_RNG_STATE.size
+        if helicopter >= 0:
+            pos = world.get(helicopter, 'position')
+            vel = world.get(helicopter, 'velocity')
+            sprite = world.get(helicopter, 'sprite')
+            rotor = world.get(helicopter, 'rotor')
+            SNAPSHOT_PLAYER.pack_into(buffer, offset, pos.x, pos.y, vel.dx, vel.dy, vel.speed, sprite.angle,
+                                      rotor.angle, rotor.rotation_speed, sprite.frame, rotor.frame)
+            offset += SNAPSHOT_PLAYER.size
+        
+        #Les trois blocs sont remplis en une passe
+        id_offset = offset
+        values_offset = id_offset + tornadoes * SNAPSHOT_TORNADO_ID.size
+        frame_offset = values_offset + tornadoes * SNAPSHOT_TORNADO_VALUES.size
+        pack_id = SNAPSHOT_TORNADO_ID.pack_into
+        pack_values = SNAPSHOT_TORNADO_VALUES.pack_into
+        pack_frame = SNAPSHOT_TORNADO_FRAME.pack_into
+        for archetype in archetypes:
+            for entity, pos, tornado in zip(archetype.entities, archetype.columns['position'],
+                                            archetype.columns['tornado']):
+                pack_id(buffer, id_offset, entity)
+                pack_values(buffer, values_offset, pos.x, pos.y, tornado.radius, tornado.speed, tornado.angle)
+                pack_frame(buffer, frame_offset, tornado.frame)
+                id_offset += SNAPSHOT_TORNADO_ID.size
+                values_offset += SNAPSHOT_TORNADO_VALUES.size
+                frame_offset += SNAPSHOT_TORNADO_FRAME.size
+        offset = frame_offset
+        
+        if field is not None:
+            count = field.count
+            SNAPSHOT_FIELD_COUNT.pack_into(buffer, offset, count)
+            offset += SNAPSHOT_FIELD_COUNT.size
+            for column in field.columns():
+                #Vue NumPy sur le slot : copie directe, sans bytes intermédiaire
+                np.frombuffer(buffer, np.float64, count, offset)[:] = column[:count]
+                offset += count * 8
+        return size
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'WorldSnapshot':
+        (magic, version, flags, tick, game_timer, spawn_counter, spawned, next_id, helicopter,
+         tornadoes) = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("not a Bermuda Explorer snapshot (or unsupported version)")
+        snapshot = cls()
+        snapshot.flags = flags
+        snapshot.tick = tick
+        snapshot.game_timer = game_timer
+        snapshot.spawn_counter = spawn_counter
+        snapshot.spawned = spawned
+        snapshot.next_id = next_id
+        snapshot.helicopter = helicopter
+        view = memoryview(data)
+        offset = SNAPSHOT_HEADER.size
+        rng_version, gauss = SNAPSHOT_RNG.unpack_from(data, offset)
+        offset += SNAPSHOT_RNG.size
+        internal = array('I')
+        internal.frombytes(view[offset:offset + 625 * internal.itemsize])
+        offset += 625 * internal.itemsize
+        snapshot.rng_state = (rng_version, tuple(internal), gauss if flags & SNAPSHOT_FLAG_GAUSS else None)
+        if helicopter >= 0:
+            snapshot.player = SNAPSHOT_PLAYER.unpack_from(data, offset)
+            offset += SNAPSHOT_PLAYER.size
+        for column, width in ((snapshot.tornado_ids, 1), (snapshot.tornado_values, SNAPSHOT_TORNADO_FIELDS),
+                              (snapshot.tornado_frames, 1)):
+            size = tornadoes * width * column.itemsize
+            column.frombytes(view[offset:offset + size])
+            offset += size
+        if flags & SNAPSHOT_FLAG_FIELD:
+            count, = SNAPSHOT_FIELD_COUNT.unpack_from(data, offset)
+            offset += SNAPSHOT_FIELD_COUNT.size
+            snapshot.field = []
+            for _ in range(SNAPSHOT_TORNADO_FIELDS):
+                column = array('d')
+                column.frombytes(view[offset:offset + count * column.itemsize])
+                offset += count * column.itemsize
+                snapshot.field.append(column)
+        return snapshot
+
+    def describe(self) -> Dict:
+        #Vue lisible pour l'inspection post-mortem
+        tornadoes = [{'id': entity, 'x': values[0], 'y': values[1], 'radius': values[2]}
+                     for entity, values in zip(self.tornado_ids,
+                                               zip(*[iter(self.tornado_values)] * SNAPSHOT_TORNADO_FIELDS))]
+        if self.field is not None:
+            tornadoes += [{'id': None, 'x': x, 'y': y, 'radius': radius}
+                          for x, y, _, radius, _ in zip(*self.field)]
+        player = None
+        if self.player is not None:
+            x, y, dx, dy, _, angle = self.player[:6]
+            player = {'id': self.helicopter, 'x': x, 'y': y, 'dx': dx, 'dy': dy, 'angle': angle}
+        return {
+            'tick': self.tick,
+            'game_timer': self.game_timer,
+            'game_over': bool(self.flags & SNAPSHOT_FLAG_GAME_OVER),
+            'spawn_counter': self.spawn_counter,
+            'helicopter': player,
+            'tornadoes': tornadoes,
+        }
+
+class SnapshotRing:
+    #Les `capacity` derniers snapshots, écrits sur place dans des slots alloués une fois
+    def __init__(self, capacity: int, slot_size: int = SNAPSHOT_SLOT_SIZE):
+        self.slots = [bytearray(slot_size) for _ in range(capacity)]
+        self.lengths = [0] * capacity  #Taille utile de chaque slot
+        self.head = 0  #Prochain slot écrit
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def capture(self, game: 'Game'):
+        self.lengths[self.head] = WorldSnapshot.capture_into(game, self.slots[self.head])
+        self.advance()
+
+    def push(self, snapshot: bytes):
+        slot = self.slots[self.head]
+        length = len(snapshot)
+        if len(slot) < length:
+            slot.extend(bytes(length - len(slot)))
+        slot[:length] = snapshot
+        self.lengths[self.head] = length
+        self.advance()
+
+    def advance(self):
+        self.head = (self.head + 1) % len(self.slots)
+        self.size = min(self.size + 1, len(self.slots))
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+    def snapshot(self, index: int) -> bytes:
+        #Copie : le slot sera réécrit par les captures suivantes
+        return bytes(self.slots[index][:self.lengths[index]])
+
+    def __iter__(self) -> Iterator[bytes]:
+        #Du plus ancien au plus récent
+        capacity = len(self.slots)
+        for index in range(self.head - self.size, self.head):
+            yield self.snapshot(index % capacity)
+
+    def oldest(self) -> Optional[bytes]:
+        return self.snapshot((self.head - self.size) % len(self.slots)) if self.size else None
+
+INPUT_SOURCES = {
+    'keyboard': lambda seed=None: KeyboardInput(),
+    'random': RandomInput,
+    'idle': lambda seed=None: ScriptedInput([]),
+}
+
+def init_pygame(headless: bool = False):
+    if headless:
+        #Pilotes factices : pas de fenêtre ni de périphérique audio
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    #Pas de pygame.init() : il ouvrirait le périphérique audio, que seul Audio ouvre quand le son est activé
+    pygame.display.init()
+    pygame.font.init()
+
+def open_window(vsync: bool = True) -> pygame.Surface:
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    if vsync:
+        #pygame 2 n'accepte la vsync qu'avec un renderer (flag SCALED)
+        try:
+            return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        except pygame.error as error:
+            print(f"warning: vsync unavailable ({error}), rendering without it", file=sys.stderr)
+    return pygame.display.set_mode(size)
+
+class Game:
+    def __init__(self, vectorized: bool = False, headless: bool = False, input_source=None,
+                 seed: Optional[int] = None, record_path: Optional[str] = None, dirty_rects: bool = False,
+                 profile: bool = False, pool_size: int = TORNADO_POOL_SIZE, parallel_systems: bool = False,
+                 audio: bool = True, volume: float = MUSIC_VOLUME, rewind: Optional[int] = None,
+                 pixel_collisions: bool = False, max_fps: int = MAX_RENDER_FPS, vsync: bool = True):
+        init_pygame(headless)
+        self.headless = headless
+        #Toujours actif en fenêtré (overlay F3), seulement sur demande en headless
+        self.profiler = FrameProfiler(enabled=profile or not headless, keep_history=profile)
+        self.show_profiler = False
+        self.profiler_overlay: Optional[pygame.Surface] = None
+        self.vectorized = vectorized
+        self.pixel_collisions = pixel_collisions
+        #Graines des parties successives (chaque redémarrage tire une nouvelle graine)
+        self.seed_source = random.Random(seed)
+        self.seed = 0
+        self.rng = random.Random()
+        self.record_path = record_path
+        self.recording: Optional[Replay] = None
+        self.games_played = 0
+        if headless:
+            #Surface hors écran : rien n'est affiché en mode headless
+            self.screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            surface_allocations.add()
+        else:
+            self.screen = open_window(vsync)
+            pygame.display.set_caption("Bermuda Explorer")
+        #Frames de jeu affichées par seconde au plus (0 = sans limite), la simulation reste à FPS ticks par seconde
+        self.max_fps = max_fps
+        self.input_source = input_source or (RandomInput() if headless else KeyboardInput())
         self.clock = pygame.time.Clock()
-        self.entities: List[Entity] = []
+        self.world = World()
         self.running = True
         self.in_menu = True
         self.in_mission_screen = False
@@ -261,100 +1904,131 @@ class Game:
         self.animation_timer = 0
         self.fade_alpha = 0
         self.boat = None
+        self.helicopter = None
+        #Centrer le bateau (gardé après le nettoyage du monde pour le respawn)
+        self.boat_position = PositionComponent((WINDOW_WIDTH - BOAT_WIDTH) / 2, (WINDOW_HEIGHT - BOAT_HEIGHT) / 2)
         self.game_timer = 0  # Timer commence à 0
-        self.timer_font = pygame.font.Font(None, 36)
-        self.last_time = 0
-        self.tornado_system = TornadoSystem()
+        self.tick = 0  #Ticks de simulation à pas fixe depuis le début de la partie
+        self.text = TextCache()
+        #Écrans fixes construits une fois, puis reconstruits seulement si leurs entrées changent
+        self.menu_screen = CachedScreen(self.build_menu)
+        self.mission_screen = CachedScreen(self.build_mission_screen)
+        self.game_over_screen = CachedScreen(self.build_game_over_screen)
+        self.shown_screen: Optional[pygame.Surface] = None
+        self.assets = AssetCache()
+        self.tornado_system = TornadoSystem(self.assets, vectorized, self.rng, pool_size, pixel_collisions)
+        #Les tornades retirées du monde retournent dans le pool
+        self.world.despawn_listeners.append(self.tornado_system.pool.release)
+        self.collision_system = CollisionSystem(pixel_perfect=pixel_collisions)
         self.game_over = False
 
         # Systèmes
         self.movement_system = MovementSystem()
-        self.render_system = RenderSystem(self.screen)
+        self.rotor_system = RotorSystem()
+        self.render_system = RenderSystem(self.screen, dirty_rects)
         self.input_system = InputSystem()
+        self.difficulty_system = DifficultySystem()
+        #L'ordre d'ajout fait foi entre systèmes en conflit
+        self.scheduler = Scheduler(self.world, self.profiler, parallel_systems)
+        self.scheduler.add('input', self.input_system)
+        self.scheduler.add('difficulty', self.difficulty_system, every=FPS)
+        self.scheduler.add('movement', self.movement_system)
+        self.scheduler.add('rotor', self.rotor_system)
+        self.scheduler.add('tornado', self.tornado_system)
+        self.scheduler.add('collision', self.collision_system)
+
+        #Snapshots des derniers ticks (restart depuis un checkpoint, post-mortem), coupés par défaut en headless
+        if rewind is None:
+            rewind = 0 if headless else REWIND_CAPACITY
+        self.rewind = SnapshotRing(rewind) if rewind else None
+        #Pas de périphérique audio en headless
+        self.audio = Audio(enabled=audio and not headless, music_volume=volume)
+        #Headless : les assets sont chargés à la demande, sans thread
+        self.loader: Optional[AssetLoader] = None
+        if headless:
+            return
 
-        # Chargement des backgrounds
-        self.background_animation = pygame.image.load(BACKGROUND_ANIMATION)
-        self.background_game = pygame.image.load(BACKGROUND_GAME)
-        self.background_animation = pygame.transform.scale(self.background_animation, (WINDOW_WIDTH, WINDOW_HEIGHT))
-        self.background_game = pygame.transform.scale(self.background_game, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        #Backgrounds et sprites décodés en arrière-plan pendant le menu
+        self.loader = AssetLoader(self.assets).start()
 
-        self.game_over_font = pygame.font.Font(None, 74)
-        self.game_over_info_font = pygame.font.Font(None, 36)
-        self.restart_font = pygame.font.Font(None, 40)
+    @property
+    def background_animation(self) -> pygame.Surface:
+        return self.assets.image(BACKGROUND_ANIMATION, (WINDOW_WIDTH, WINDOW_HEIGHT), opaque=True)
+
+    @property
+    def background_game(self) -> pygame.Surface:
+        return self.assets.image(BACKGROUND_GAME, (WINDOW_WIDTH, WINDOW_HEIGHT), opaque=True)
 
-        self.background_music = pygame.mixer.Sound(BACKGROUND_MUSIC)
-        self.background_music.set_volume(0.4)  #Ajuster le volume (0.0 à 1.0)
 
     def create_boat(self):
-        boat = Entity()
-        #Centrer le bateau
-        boat_width, boat_height = 103, 212
-        boat_x = (WINDOW_WIDTH - boat_width) / 2
-        boat_y = (WINDOW_HEIGHT - boat_height) / 2
-        boat.components['position'] = PositionComponent(boat_x, boat_y)
-        boat.components['sprite'] = SpriteComponent("./assets/images/boat-sprite.png", boat_width, boat_height)
-        self.entities.append(boat)
-        self.boat = boat
-        return boat
+        self.boat = self.world.spawn(
+            position=PositionComponent(self.boat_position.x, self.boat_position.y),
+            sprite=SpriteComponent(self.assets.atlas(BOAT_SPRITE, (BOAT_WIDTH, BOAT_HEIGHT)), LAYER_BOAT),
+        )
+        return self.boat
 
     def create_helicopter(self):
-        helicopter = Entity()
-        boat_pos = self.boat.components['position']
-        heli_size = 104  #Un carré
-        heli_x = boat_pos.x + (103 - heli_size) / 2
-        heli_y = boat_pos.y + heli_size - 30
+        boat_pos = self.boat_position
+        heli_x = boat_pos.x + (BOAT_WIDTH - HELI_SIZE) / 2
+        heli_y = boat_pos.y + HELI_SIZE - 30
         
-        helicopter.components['position'] = PositionComponent(heli_x, heli_y)
-        helicopter.components['velocity'] = VelocityComponent()
-        helicopter.components['sprite'] = SpriteComponent("./assets/images/heli-sprite.png", heli_size, heli_size)
         #Ajout du rotor avec une taille proportionnelle à l'hélico
-        rotor_size = 92  #Taille du rotor
-        helicopter.components['rotor'] = RotorComponent("./assets/images/rotor-sprite.png", rotor_size, rotor_size, heli_size)
-        self.entities.append(helicopter)
+        heli_atlas = self.assets.atlas(HELI_SPRITE, (HELI_SIZE, HELI_SIZE))
+        self.helicopter = self.world.spawn(
+            position=PositionComponent(heli_x, heli_y),
+            velocity=VelocityComponent(),
+            sprite=SpriteComponent(heli_atlas),
+            rotor=RotorComponent(self.assets.atlas(ROTOR_SPRITE, (ROTOR_SIZE, ROTOR_SIZE)), HELI_SIZE),
+            #Rayon de la hitbox basé sur l'image originale, centrée sur l'image tournée
+            collider=ColliderComponent(HELI_SIZE / 2, COLLISION_LAYER_PLAYER, COLLISION_LAYER_TORNADO, heli_atlas),
+        )
+        return self.helicopter
 
-    def draw_menu(self):
-        self.screen.fill(BLACK)
+    def build_menu(self) -> pygame.Surface:
+        surface = pygame.Surface(self.screen.get_size()).convert()
+        surface_allocations.add(2)
+        surface.fill(BLACK)
+        width, height = surface.get_size()
         
         #Titre du jeu
-        title_font = pygame.font.Font(None, TITLE_FONT_SIZE)
-        title_text = title_font.render(GAME_TITLE, True, WHITE)
-        title_rect = title_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/4))
+        title_text = self.text.render(GAME_TITLE, TITLE_FONT_SIZE)
+        title_rect = title_text.get_rect(center=(width/2, height/4))
         
-        #Image du menu
-        menu_image = pygame.image.load("./assets/images/heli-menu.png")  # Créez cette image
-        menu_image = pygame.transform.scale(menu_image, (634, 215))  # Ajustez la taille selon vos besoins
-        image_rect = menu_image.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
+        #Image du menu, affichée dès que le thread de chargement l'a décodée
+        if self.assets.has_image(MENU_IMAGE, MENU_IMAGE_SIZE):
+            menu_image = self.assets.image(MENU_IMAGE, MENU_IMAGE_SIZE)
+            surface.blit(menu_image, menu_image.get_rect(center=(width/2, height/2)))
         
         #Texte "press space to start"
-        subtitle_font = pygame.font.Font(None, SUBTITLE_FONT_SIZE)
-        subtitle_text = subtitle_font.render(START_TEXT, True, WHITE)
-        subtitle_rect = subtitle_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT * 3/4))
+        subtitle_text = self.text.render(START_TEXT, SUBTITLE_FONT_SIZE)
+        subtitle_rect = subtitle_text.get_rect(center=(width/2, height * 3/4))
         
         #Affichage des éléments
-        self.screen.blit(title_text, title_rect)
-        self.screen.blit(menu_image, image_rect)
-        self.screen.blit(subtitle_text, subtitle_rect)
-        pygame.display.flip()
+        surface.blit(title_text, title_rect)
+        surface.blit(subtitle_text, subtitle_rect)
+        self.draw_loading_progress(surface)
+        return surface
 
-    def draw_mission_screen(self):
-        self.screen.fill(BLACK)
+    def build_mission_screen(self) -> pygame.Surface:
+        surface = pygame.Surface(self.screen.get_size()).convert()
+        surface_allocations.add(2)
+        surface.fill(BLACK)
+        width, height = surface.get_size()
         
         #Titre de la mission
-        mission_font = pygame.font.Font(None, 50)
-        mission_title = mission_font.render(MISSION_TITLE, True, WHITE)
+        mission_title = self.text.render(MISSION_TITLE, 50)
         title_rect = mission_title.get_rect(topleft=(50, 50))
         
-        #Texte principal
-        text_font = pygame.font.Font(None, 36)
+        #Texte principal, découpé en lignes selon la largeur mesurée
+        text_font = self.text.font(36)
         words = MISSION_TEXT.split()
         lines = []
         current_line = []
         current_width = 0
-        max_width = WINDOW_WIDTH - 100
+        max_width = width - 100
         
         for word in words:
-            word_surface = text_font.render(word + " ", True, WHITE)
-            word_width = word_surface.get_width()
+            word_width = text_font.size(word + " ")[0]
             if current_width + word_width <= max_width:
                 current_line.append(word)
                 current_width += word_width
@@ -368,19 +2042,44 @@ class Game:
         y_offset = 150
         for line in lines:
             text_surface = text_font.render(line, True, WHITE)
+            surface_allocations.add()
             text_rect = text_surface.get_rect(topleft=(50, y_offset))
-            self.screen.blit(text_surface, text_rect)
+            surface.blit(text_surface, text_rect)
             y_offset += 40
         
         #Texte "Press space to continue"
-        continue_font = pygame.font.Font(None, 40)
-        continue_text = continue_font.render(CONTINUE_TEXT, True, WHITE)
-        continue_rect = continue_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT - 50))
+        continue_text = self.text.render(CONTINUE_TEXT, 40)
+        continue_rect = continue_text.get_rect(center=(width/2, height - 50))
         
         #Affichage des éléments
-        self.screen.blit(mission_title, title_rect)
-        self.screen.blit(continue_text, continue_rect)
-        pygame.display.flip()
+        surface.blit(mission_title, title_rect)
+        surface.blit(continue_text, continue_rect)
+        self.draw_loading_progress(surface)
+        return surface
+
+    def draw_loading_progress(self, surface: pygame.Surface):
+        #Fine barre en bas de l'écran tant que le chargement n'est pas fini
+        if self.loader is None or self.loader.done:
+            return
+        width, height = surface.get_size()
+        pygame.draw.rect(surface, WHITE, (0, height - 4, int(width * self.loader.progress()), 4))
+
+    def show_static_screen(self, screen: CachedScreen, key=None):
+        #Écran fixe : blit + flip seulement quand son contenu a changé
+        if key is None:
+            loaded = self.loader.loaded if self.loader is not None else 0
+            key = (self.screen.get_size(), loaded)
+        surface = screen.get(key)
+        if surface is not self.shown_screen:
+            self.screen.blit(surface, (0, 0))
+            pygame.display.flip()
+            self.shown_screen = surface
+
+    def draw_menu(self):
+        self.show_static_screen(self.menu_screen)
+
+    def draw_mission_screen(self):
+        self.show_static_screen(self.mission_screen)
 
     def start_mission_screen(self):
         self.in_menu = False
@@ -390,135 +2089,572 @@ class Game:
         self.in_mission_screen = False
         self.in_intro_animation = True
         self.animation_timer = 0
+        if self.loader is not None:
+            self.loader.wait()
         self.create_boat()
         self.create_helicopter()
 
+    @property
+    def simulating(self) -> bool:
+        #La simulation à pas fixe tourne pendant l'intro et la partie, pas sur les écrans fixes
+        return self.in_intro_animation or not (self.in_menu or self.in_mission_screen or self.game_over)
+
     def update_intro_animation(self):
         self.animation_timer += 1
         
-        helicopter = self.entities[-1]
-        heli_pos = helicopter.components['position']
-        rotor = helicopter.components['rotor']
+        heli_pos = self.world.get(self.helicopter, 'position')
+        rotor = self.world.get(self.helicopter, 'rotor')
         
         if self.animation_timer < 120:  # 2 premières secondes : démarrage du rotor
             rotor.rotation_speed = min(rotor.rotation_speed + 1, 15)  #Accél progressive
         elif self.animation_timer < 300:  #Décollage
             rotor.rotation_speed = 30  #Vitesse max
             heli_pos.y -= 2.3
+            heli_pos.version += 1
         elif self.animation_timer < 360:  #Fondu au noir
             self.fade_alpha = min(255, self.fade_alpha + 5)
         else:
             self.in_intro_animation = False
             self.setup_game_world()
 
-    def setup_game_world(self):
-        self.entities.clear()
+    def setup_game_world(self, seed: Optional[int] = None):
+        #La partie précédente est abandonnée : l'enregistrer avant d'en commencer une nouvelle
+        self.save_recording()
+        self.seed = seed if seed is not None else self.seed_source.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.games_played += 1
+        if self.record_path:
+            flags = REPLAY_FLAG_VECTORIZED if self.vectorized else 0
+            if self.pixel_collisions:
+                flags |= REPLAY_FLAG_PIXEL_COLLISIONS
+            self.recording = Replay(self.seed, flags)
+        self.world.clear()
+        self.render_system.invalidate()
+        self.tornado_system.reset()
         self.create_helicopter()
-        helicopter = self.entities[-1]
         #vitesse de rotation maxdu rotor
-        helicopter.components['rotor'].rotation_speed = 30
+        self.world.get(self.helicopter, 'rotor').rotation_speed = 30
         self.game_timer = 0
-        self.last_time = pygame.time.get_ticks()
+        self.tick = 0
         self.game_over = False
+        self.render_system.save_previous_state(self.world)
+        if self.rewind is not None:
+            self.rewind.clear()
+
+    def restore_snapshot(self, snapshot):
+        #Remet le monde dans l'état d'un snapshot (bytes ou WorldSnapshot déjà décodé), sans recharger d'assets
+        if not isinstance(snapshot, WorldSnapshot):
+            snapshot = WorldSnapshot.decode(snapshot)
+        if self.recording is not None and len(self.recording.masks) < snapshot.tick:
+            #Un replay rejoue depuis le tick 0 : les ticks d'avant le snapshot manqueraient
+            raise ValueError("cannot record a game resumed from a snapshot that is not part of the recording")
+        world = self.world
+        tornado_system = self.tornado_system
+        player = None
+        if snapshot.helicopter >= 0:
+            #Les composants de l'hélico sont réutilisés, seul leur état change
+            if self.helicopter is None or not world.alive(self.helicopter):
+                self.create_helicopter()
+            archetype = world.locations[self.helicopter]
+            player = archetype.row_components(archetype.rows[self.helicopter])
+        world.clear()  #Les tornades retournent dans le pool
+        if player is not None:
+            (x, y, player['velocity'].dx, player['velocity'].dy, player['velocity'].speed, player['sprite'].angle,
+             player['rotor'].angle, player['rotor'].rotation_speed, player['sprite'].frame,
+             player['rotor'].frame) = snapshot.player
+            player['position'].x = x
+            player['position'].y = y
+            for name in ('position', 'velocity', 'sprite'):
+                player[name].version += 1
+            self.helicopter = world.spawn_bundle(player, entity=snapshot.helicopter)
+        values = snapshot.tornado_values
+        pool = tornado_system.pool
+        for index, entity in enumerate(snapshot.tornado_ids):
+            base = index * SNAPSHOT_TORNADO_FIELDS
+            tornado = pool.spawn(world, values[base], values[base + 1], entity)['tornado']
+            tornado.radius = values[base + 2]
+            tornado.speed = values[base + 3]
+            tornado.angle = values[base + 4]
+            tornado.frame = snapshot.tornado_frames[index]
+        world.next_id = snapshot.next_id
+        field = tornado_system.field
+        if field is not None and snapshot.field is not None:
+            count = len(snapshot.field[0])
+            while len(field.x) < count:
+                field.grow()
+            for column, values in zip(field.columns(), snapshot.field):
+                column[:count] = values
+            field.count = count
+        tornado_system.spawn_counter = snapshot.spawn_counter
+        tornado_system.spawned = snapshot.spawned
+        tornado_system.field_hit = bool(snapshot.flags & SNAPSHOT_FLAG_FIELD_HIT)
+        self.rng.setstate(snapshot.rng_state)
+        self.tick = snapshot.tick
+        self.game_timer = snapshot.game_timer
+        self.game_over = bool(snapshot.flags & SNAPSHOT_FLAG_GAME_OVER)
+        #Le taux de spawn ne dépend que de game_timer
+        world.resources['game_timer'] = self.game_timer
+        self.difficulty_system.update(world)
+        tornado_system.current_spawn_rate = world.resources['spawn_rate']
+        if self.recording is not None:
+            del self.recording.masks[self.tick:]
+        self.render_system.save_previous_state(world)
+        self.render_system.invalidate()
+        self.game_over_screen.invalidate()
+
+    def restart_from_checkpoint(self) -> bool:
+        #Reprendre la partie au plus ancien snapshot gardé (quelques secondes avant le game over)
+        if self.rewind is None or not len(self.rewind):
+            return False
+        checkpoint = self.rewind.oldest()
+        self.restore_snapshot(checkpoint)
+        self.rewind.clear()
+        self.rewind.push(checkpoint)
+        return True
+
+    def step(self):
+        #Un tick de simulation à pas fixe, indépendant du rendu
+        keys = self.input_source.read()
+        if self.recording is not None:
+            self.recording.masks.append(keys)
+        resources = self.world.resources
+        resources['input'] = keys
+        resources['game_timer'] = self.game_timer
+        self.scheduler.run(self.tick)
+        if self.tornado_system.hit_player(self.world):
+            self.game_over = True
+        self.world.flush()
+        self.update_timer()
+        if self.rewind is not None:
+            self.rewind.capture(self)
+
+    def save_recording(self):
+        if self.recording is None:
+            return
+        #"{game}" dans le chemin donne un fichier par partie, sinon le dernier écrase le précédent
+        self.recording.save(self.record_path.format(game=self.games_played))
+        self.recording = None
 
     def update_timer(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_time >= 1000:
+        #Le temps de jeu avance avec les ticks, pas avec l'horloge murale
+        self.tick += 1
+        if self.tick % FPS == 0:
             self.game_timer += 1    #Augmentation du timer
-            self.last_time = current_time
+
+    def run_headless(self, max_ticks: Optional[int] = None, seed: Optional[int] = None,
+                     snapshot: Optional[bytes] = None) -> Dict[str, float]:
+        #Simulation seule, aussi vite que le CPU le permet, éventuellement reprise depuis un snapshot
+        self.setup_game_world(seed)
+        if snapshot is not None:
+            self.restore_snapshot(snapshot)
+        first_tick = self.tick
+        pool = self.tornado_system.pool
+        pool_hits, pool_misses, pool_dropped = pool.hits, pool.misses, pool.dropped
+        clock = time.perf_counter_ns
+        slowest_tick = 0
+        start = clock()
+        while not self.game_over and (max_ticks is None or self.tick < max_ticks):
+            tick_start = clock()
+            self.profiler.begin_frame()
+            self.step()
+            slowest_tick = max(slowest_tick, clock() - tick_start)
+            if self.profiler.enabled:
+                self.end_profiler_frame()
+        elapsed = clock() - start
+        #Pas de threads laissés en vie entre deux parties (ni à la sortie d'un worker)
+        self.scheduler.shutdown()
+        return {
+            'ticks': self.tick,
+            'survival_time': self.tick / FPS,
+            'game_timer': self.game_timer,
+            'game_over': self.game_over,
+            'tornadoes': self.tornado_system.tornado_count(self.world),
+            'tornadoes_spawned': self.tornado_system.spawned,
+            'elapsed': elapsed / 1e9,
+            'mean_tick_us': elapsed / max(self.tick - first_tick, 1) / 1000,
+            'max_tick_us': slowest_tick / 1000,
+            'seed': self.seed,
+            'pool_hits': pool.hits - pool_hits,
+            'pool_misses': pool.misses - pool_misses,
+            'pool_dropped': pool.dropped - pool_dropped,
+        }
+
+    def end_profiler_frame(self):
+        queue = self.render_system.queue
+        self.profiler.end_frame(entities=len(self.world),
+                                tornadoes=self.tornado_system.tornado_count(self.world),
+                                drawn=queue.submitted, culled=queue.culled)
+        queue.reset_stats()
+
+    def draw_profiler_overlay(self):
+        #Texte re-rendu périodiquement pour ne pas fausser le compte d'allocations
+        if self.profiler_overlay is None or self.profiler.frame_count % PROFILER_OVERLAY_REFRESH == 0:
+            lines = [f"FPS {self.clock.get_fps():5.1f}"] + self.profiler.report_lines()
+            font = self.text.font(PROFILER_FONT_SIZE)
+            line_height = font.get_linesize()
+            width = max(font.size(line)[0] for line in lines) + 10
+            overlay = pygame.Surface((width, line_height * len(lines) + 10), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 160))
+            for index, line in enumerate(lines):
+                overlay.blit(font.render(line, True, WHITE), (5, 5 + index * line_height))
+            surface_allocations.add(1 + len(lines))
+            self.profiler_overlay = overlay
+        self.render_system.submit(self.profiler_overlay, (10, 10), LAYER_DEBUG)
 
     def draw_timer(self):
-        timer_text = self.timer_font.render(f"Time: {self.game_timer}", True, WHITE)
+        #Rendu en cache : le texte n'est re-rendu que quand game_timer change
+        timer_text = self.text.render(f"Time: {self.game_timer}", 36)
         timer_rect = timer_text.get_rect(topright=(WINDOW_WIDTH - 20, 20))
-        self.screen.blit(timer_text, timer_rect)
+        self.render_system.submit(timer_text, timer_rect.topleft, LAYER_UI)
 
-    def draw_game_over_screen(self):
-        #Surface semi-transparente noire
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        self.screen.blit(overlay, (0, 0))
+    def build_game_over_screen(self) -> pygame.Surface:
+        #Scène figée au moment du crash, dessinée une fois par la file de rendu puis copiée
+        render_system = self.render_system
+        render_system.invalidate()
+        render_system.begin_frame(self.background_game)
+        render_system.update(self.world)
+        render_system.draw_queue()
+        surface = self.screen.copy()
+        
+        #Voile semi-transparent noir, textes compris
+        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        surface_allocations.add(2)
+        overlay.fill((0, 0, 0, 128))
+        width, height = overlay.get_size()
 
         #Texte "Game Over"
-        game_over_text = self.game_over_font.render('Game Over', True, WHITE)
-        game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 60))
+        game_over_text = self.text.render('Game Over', 74)
+        game_over_rect = game_over_text.get_rect(center=(width/2, height/2 - 60))
         
         #Temps survécu
-        time_text = self.game_over_info_font.render(f'Time survived: {self.game_timer} seconds', True, WHITE)
-        time_rect = time_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 20))
+        time_text = self.text.render(f'Time survived: {self.game_timer} seconds', 36)
+        time_rect = time_text.get_rect(center=(width/2, height/2 + 20))
         
         #Message pour redémarrer
-        restart_text = self.game_over_info_font.render('Press SPACE to restart', True, WHITE)
-        restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 80))
+        restart_message = 'Press SPACE to restart, R to rewind' if self.rewind is not None else 'Press SPACE to restart'
+        restart_text = self.text.render(restart_message, 36)
+        restart_rect = restart_text.get_rect(center=(width/2, height/2 + 80))
         
         #Afficher tous les textes
-        self.screen.blit(game_over_text, game_over_rect)
-        self.screen.blit(time_text, time_rect)
-        self.screen.blit(restart_text, restart_rect)
+        overlay.blit(game_over_text, game_over_rect)
+        overlay.blit(time_text, time_rect)
+        overlay.blit(restart_text, restart_rect)
+        surface.blit(overlay, (0, 0))
+        return surface
+
+    def draw_game_over_screen(self):
+        #Reconstruit seulement pour une nouvelle fin de partie (ou un rewind) ou si la taille de l'écran change
+        self.show_static_screen(self.game_over_screen, (self.games_played, self.tick, self.screen.get_size()))
 
     def run(self):
-        #Jouer la musique en boucle
-        self.background_music.play(loops=-1)
+        #Jouer la musique en boucle, lue en streaming
+        self.audio.play_music(BACKGROUND_MUSIC)
         
         fade_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        surface_allocations.add()
         fade_surface.fill((0, 0, 0))
+        #Temps réel pas encore simulé : la simulation avance par ticks fixes, le rendu interpole entre deux ticks
+        accumulator = 0.0
+        last_time = time.perf_counter()
 
         while self.running:
+            now = time.perf_counter()
+            frame_time = now - last_time
+            last_time = now
+            self.profiler.begin_frame()
+            self.audio.update()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    #La fenêtre doit être redessinée : réafficher l'écran fixe
+                    self.shown_screen = None
+                    self.render_system.invalidate()
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
+                    if event.key == pygame.K_F3:
+                        #Afficher / masquer l'overlay de profilage
+                        self.show_profiler = not self.show_profiler
+                        self.render_system.invalidate()
+                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                        self.audio.set_music_volume(self.audio.music_volume + VOLUME_STEP)
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.audio.set_music_volume(self.audio.music_volume - VOLUME_STEP)
+                    elif event.key == pygame.K_SPACE:
                         if self.in_menu:
                             self.start_mission_screen()
                         elif self.in_mission_screen:
                             self.start_intro_animation()
                         elif self.game_over: 
                             self.setup_game_world()
+                    elif event.key == pygame.K_r and self.game_over:
+                        #Reprendre quelques secondes avant le crash
+                        self.restart_from_checkpoint()
+
+            #Rattraper le temps écoulé par ticks fixes, en sautant des frames d'affichage si le rendu est lent
+            alpha = 1.0
+            if self.simulating:
+                accumulator += frame_time
+                ticks = 0
+                phase_over = False
+                while accumulator >= TICK_DURATION and ticks < MAX_CATCH_UP_TICKS and not phase_over:
+                    accumulator -= TICK_DURATION
+                    ticks += 1
+                    self.render_system.save_previous_state(self.world)
+                    if self.in_intro_animation:
+                        self.rotor_system.update(self.world)
+                        self.update_intro_animation()
+                        phase_over = not self.in_intro_animation
+                    else:
+                        self.step()
+                        phase_over = self.game_over
+                if phase_over or accumulator >= TICK_DURATION:
+                    #Fin de phase ou trop de retard : abandonner le reste plutôt que ralentir indéfiniment
+                    accumulator = 0.0
+                else:
+                    alpha = accumulator / TICK_DURATION
+            else:
+                accumulator = 0.0
 
             if self.in_menu:
                 self.draw_menu()
             elif self.in_mission_screen:
                 self.draw_mission_screen()
             elif self.in_intro_animation:
-                self.screen.blit(self.background_animation, (0, 0))
-                self.render_system.update(self.entities)
-                self.update_intro_animation()
+                self.render_system.begin_frame(self.background_animation)
+                self.render_system.update(self.world, alpha)
                 
                 #Appliquer le fondu au noir si nécessaire
                 if self.fade_alpha > 0:
                     fade_surface.set_alpha(self.fade_alpha)
-                    self.screen.blit(fade_surface, (0, 0))
+                    self.render_system.submit(fade_surface, (0, 0), LAYER_UI)
+                    self.render_system.invalidate()
                 
-                pygame.display.flip()
+                self.render_system.present()
+            elif self.game_over:
+                #Jeu figé sous l'overlay, composé une fois comme les menus
+                self.draw_game_over_screen()
             else:
-                #Jeu normal
-                self.screen.blit(self.background_game, (0, 0))
-                
-                if not self.game_over:
-                    self.input_system.update(self.entities)
-                    self.movement_system.update(self.entities)
-                    
-                    if self.tornado_system.update(self.entities, self.game_timer):
-                        self.game_over = True
-                    
-                    self.render_system.update(self.entities)
-                    self.update_timer()
+                #Jeu normal ; le prochain écran fixe devra être réaffiché
+                self.shown_screen = None
+                self.render_system.begin_frame(self.background_game)
+                with self.profiler.section('render'):
+                    self.render_system.update(self.world, alpha)
                     self.draw_timer()
-                else:
-                    # Afficher quand même le jeu en arrière-plan
-                    self.render_system.update(self.entities)
-                    self.draw_game_over_screen()
                 
-                pygame.display.flip()
+                if self.show_profiler:
+                    self.draw_profiler_overlay()
+                #Envoi groupé des commandes de dessin de la frame
+                with self.profiler.section('draw'):
+                    self.render_system.draw_queue()
+                with self.profiler.section('present'):
+                    self.render_system.present()
 
-            self.clock.tick(FPS)
+            self.end_profiler_frame()
+            #Écrans fixes (menus, game over) : rien à interpoler, limiter la boucle pour ne pas occuper un cœur
+            self.clock.tick(self.max_fps if self.simulating else FPS)
 
-        self.background_music.stop()  # Arrêter la musique
-        pygame.mixer.quit()  # Fermer le système audio
+        self.save_recording()  #Partie en cours au moment de quitter
+        self.scheduler.shutdown()
+        self.audio.quit()  #Arrêter la musique et fermer le système audio
         pygame.quit()
         sys.exit()
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=GAME_TITLE.title())
+    parser.add_argument("--vectorized", action="store_true",
+                        help="simulate tornadoes as NumPy arrays (requires numpy)")
+    parser.add_argument("--pixel-collisions", action="store_true",
+                        help="test collisions pixel by pixel once bounding circles overlap")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw and update only the screen regions that changed")
+    parser.add_argument("--fps", type=int, default=MAX_RENDER_FPS,
+                        help="maximum rendered frames per second during play, 0 for uncapped "
+                             "(default: %(default)s); the simulation always runs at 60 ticks per second")
+    parser.add_argument("--no-vsync", action="store_true",
+                        help="do not synchronise rendering with the display refresh")
+    parser.add_argument("--tornado-pool", type=int, default=TORNADO_POOL_SIZE,
+                        help="maximum number of despawned tornadoes kept for reuse")
+    parser.add_argument("--parallel-systems", action="store_true",
+                        help="run independent systems of a tick on a thread pool")
+    parser.add_argument("--volume", type=float, default=MUSIC_VOLUME,
+                        help="music volume between 0.0 and 1.0")
+    parser.add_argument("--no-audio", action="store_true",
+                        help="play without sound, without opening an audio device")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without display or audio, as fast as possible")
+    parser.add_argument("--games", type=int, default=1,
+                        help="number of headless games to simulate")
+    parser.add_argument("--max-ticks", type=int, default=None,
+                        help="stop a headless game after this many simulation ticks")
+    parser.add_argument("--input", choices=sorted(INPUT_SOURCES), default=None,
+                        help="input source (default: keyboard, or random when headless)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for headless games (0: one per CPU core)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed; headless game N uses seed + N (default: 0 headless, random otherwise)")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record seed and inputs of each game; '{game}' in PATH is replaced by the game number")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="replay a recorded game headless at full speed")
+    parser.add_argument("--rewind", type=int, default=None,
+                        help=f"ticks of snapshots kept for restart-from-checkpoint and post-mortem "
+                             f"(default: {REWIND_CAPACITY} in a window, 0 headless)")
+    parser.add_argument("--post-mortem", metavar="PATH", default=None,
+                        help="with --replay, write the snapshots of the last ticks before game over as JSON")
+    parser.add_argument("--json", metavar="PATH", default=None,
+                        help="write aggregated headless results to a JSON file")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print one line per headless game")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="export per-tick system timings of a headless run or replay (.csv or .json)")
+    args = parser.parse_args(argv)
+    if args.profile and args.workers != 1:
+        parser.error("--profile requires --workers 1")
+    #Les replays stockent la graine sur 64 bits non signés
+    if args.seed is not None and not 0 <= args.seed <= 2 ** 64 - args.games:
+        parser.error("--seed must be a non-negative 64-bit integer")
+    return args
+
+#Exécution des épisodes headless (un Game réutilisé par processus)
+episode_game: Optional[Game] = None
+
+def init_episode_worker(vectorized: bool, profile: bool = False, pool_size: int = TORNADO_POOL_SIZE,
+                        parallel_systems: bool = False, pixel_collisions: bool = False):
+    global episode_game
+    #Une seule instance : les assets restent en cache d'un épisode à l'autre
+    episode_game = Game(vectorized=vectorized, headless=True, profile=profile, pool_size=pool_size,
+                        parallel_systems=parallel_systems, pixel_collisions=pixel_collisions)
+
+def run_episode(seed: int, policy: str, max_ticks: Optional[int]) -> Dict[str, float]:
+    #Graine propre à l'épisode pour les spawns et pour la politique d'entrée
+    episode_game.input_source = INPUT_SOURCES[policy](seed)
+    return episode_game.run_headless(max_ticks, seed)
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize_episodes(results: List[Dict[str, float]], workers: int, elapsed: float) -> Dict:
+    survival = [result['survival_time'] for result in results]
+    spawned = [result['tornadoes_spawned'] for result in results]
+    tick_times = [result['mean_tick_us'] for result in results]
+    ticks = sum(result['ticks'] for result in results)
+    return {
+        'episodes': len(results),
+        'workers': workers,
+        'elapsed': elapsed,
+        'episodes_per_min': len(results) / elapsed * 60,
+        'ticks_per_second': ticks / elapsed,
+        'survival_time': {
+            'mean': sum(survival) / len(survival),
+            'min': min(survival),
+            'p50': percentile(survival, 0.5),
+            'p95': percentile(survival, 0.95),
+            'max': max(survival),
+        },
+        'tornadoes_spawned': {'mean': sum(spawned) / len(spawned), 'max': max(spawned)},
+        'tornado_pool': {
+            'hits': sum(result['pool_hits'] for result in results),
+            'misses': sum(result['pool_misses'] for result in results),
+            'dropped': sum(result['pool_dropped'] for result in results),
+        },
+        'tick_us': {
+            'mean': sum(tick_times) / len(tick_times),
+            'p95': percentile(tick_times, 0.95),
+            'max': max(result['max_tick_us'] for result in results),
+        },
+        'results': results,
+    }
+
+def run_episodes(episodes: int, workers: int = 1, seed: int = 0, policy: str = 'random',
+                 max_ticks: Optional[int] = None, vectorized: bool = False,
+                 profile_path: Optional[str] = None, pool_size: int = TORNADO_POOL_SIZE,
+                 parallel_systems: bool = False, pixel_collisions: bool = False) -> Dict:
+    seeds = [seed + index for index in range(episodes)]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1:
+        init_episode_worker(vectorized, profile_path is not None, pool_size, parallel_systems, pixel_collisions)
+        results = [run_episode(episode_seed, policy, max_ticks) for episode_seed in seeds]
+        if profile_path:
+            episode_game.profiler.export(profile_path)
+    else:
+        #Un processus par cœur, chacun avec son propre Game headless
+        with ProcessPoolExecutor(workers, initializer=init_episode_worker,
+                                 initargs=(vectorized, False, pool_size, parallel_systems,
+                                           pixel_collisions)) as pool:
+            chunksize = max(1, episodes // (workers * 8))
+            results = list(pool.map(run_episode, seeds, [policy] * episodes, [max_ticks] * episodes,
+                                    chunksize=chunksize))
+    return summarize_episodes(results, workers, time.perf_counter() - start)
+
+def run_replay(args: argparse.Namespace):
+    replay = Replay.load(args.replay)
+    rewind = args.rewind
+    if args.post_mortem and not rewind:
+        rewind = REWIND_CAPACITY
+    game = Game(vectorized=bool(replay.flags & REPLAY_FLAG_VECTORIZED), headless=True,
+                input_source=ReplayInput(replay), profile=args.profile is not None,
+                pool_size=args.tornado_pool, parallel_systems=args.parallel_systems, rewind=rewind,
+                pixel_collisions=bool(replay.flags & REPLAY_FLAG_PIXEL_COLLISIONS))
+    result = game.run_headless(len(replay.masks), replay.seed)
+    if args.profile:
+        game.profiler.export(args.profile)
+    if args.post_mortem:
+        #Derniers ticks avant la fin de la partie, du plus ancien au plus récent
+        with open(args.post_mortem, 'w') as output:
+            json.dump([WorldSnapshot.decode(snapshot).describe() for snapshot in game.rewind], output, indent=2)
+    outcome = "game over" if result['game_over'] else "still alive"
+    print(f"replay {args.replay} (seed {replay.seed}): {outcome} at tick {result['ticks']} "
+          f"of {len(replay.masks)} recorded, in {result['elapsed'] * 1000:.1f} ms")
+    print(f"tick time: mean {result['mean_tick_us']:.1f} us, max {result['max_tick_us']:.1f} us")
+
+def record_headless_game(args: argparse.Namespace):
+    game = Game(vectorized=args.vectorized, headless=True, record_path=args.record, pool_size=args.tornado_pool,
+                parallel_systems=args.parallel_systems, pixel_collisions=args.pixel_collisions)
+    for index in range(args.games):
+        #Comme run_episodes : la partie N utilise seed + N pour les spawns et les entrées
+        seed = args.seed + index if args.seed is not None else None
+        game.input_source = INPUT_SOURCES[args.input or 'random'](seed)
+        result = game.run_headless(args.max_ticks, seed)
+        game.save_recording()
+        print(f"recorded seed {result['seed']}: {result['ticks']} ticks to "
+              f"{args.record.format(game=game.games_played)}")
+
+def run_headless_games(args: argparse.Namespace):
+    summary = run_episodes(args.games, args.workers, args.seed or 0, args.input or 'random',
+                           args.max_ticks, args.vectorized, args.profile, args.tornado_pool,
+                           args.parallel_systems, args.pixel_collisions)
+    if args.verbose:
+        for result in summary['results']:
+            print(f"seed {result['seed']}: survived {result['survival_time']:.2f}s "
+                  f"({result['ticks']} ticks, {result['tornadoes_spawned']} tornadoes) "
+                  f"in {result['elapsed'] * 1000:.1f} ms")
+    survival = summary['survival_time']
+    print(f"{summary['episodes']} games on {summary['workers']} worker(s) in {summary['elapsed']:.2f}s "
+          f"({summary['episodes_per_min']:.0f} games/min, {summary['ticks_per_second']:.0f} ticks/s)")
+    print(f"survival: mean {survival['mean']:.2f}s, p50 {survival['p50']:.2f}s, "
+          f"p95 {survival['p95']:.2f}s, max {survival['max']:.2f}s")
+    print(f"tick time: mean {summary['tick_us']['mean']:.1f} us, max {summary['tick_us']['max']:.1f} us")
+    pool = summary['tornado_pool']
+    print(f"tornado pool: {pool['hits']} hits, {pool['misses']} misses, {pool['dropped']} dropped (pool full)")
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(summary, output, indent=2)
+
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    args = parse_args()
+    if args.replay:
+        run_replay(args)
+    elif args.headless and args.record:
+        record_headless_game(args)
+    elif args.headless:
+        run_headless_games(args)
+    else:
+        input_source = INPUT_SOURCES[args.input](args.seed) if args.input else None
+        game = Game(vectorized=args.vectorized, input_source=input_source, seed=args.seed,
+                    record_path=args.record, dirty_rects=args.dirty_rects, pool_size=args.tornado_pool,
+                    parallel_systems=args.parallel_systems, audio=not args.no_audio, volume=args.volume,
+                    rewind=args.rewind, pixel_collisions=args.pixel_collisions, max_fps=args.fps,
+                    vsync=not args.no_vsync)
+        game.run()
\ No newline at end of file